@@ -1,18 +1,47 @@
 """Stromer platform for Home Assistant Core."""
 
+from collections.abc import Mapping
 from datetime import timedelta
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.const import (
+    CONF_PASSWORD,
+    CONF_TOKEN,
+    CONF_USERNAME,
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
+    EVENT_HOMEASSISTANT_STOP,
+    Platform,
+)
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
 
-from .const import CONF_CLIENT_ID, CONF_CLIENT_SECRET, DOMAIN, LOGGER
-from .coordinator import StromerDataUpdateCoordinator
-from .stromer import ApiError, NextLocationError, Stromer
+from .const import (
+    ACCOUNTS,
+    CONF_CLIENT_ID,
+    CONF_CLIENT_SECRET,
+    CONF_HISTORY_RETENTION,
+    CONF_INTERVAL_MOVING,
+    CONF_INTERVAL_PARKED,
+    CONF_INTERVAL_STATE,
+    CONF_PAYLOAD_LOGGING,
+    DEFAULT_HISTORY_RETENTION,
+    DEFAULT_INTERVAL_MOVING,
+    DEFAULT_INTERVAL_PARKED,
+    DEFAULT_INTERVAL_STATE,
+    DEFAULT_PAYLOAD_LOGGING,
+    DOMAIN,
+    LOGGER,
+)
+from .coordinator import SNAPSHOT_VERSION, StromerDataUpdateCoordinator
+from .history import StromerHistory
+from .stromer import ApiError, AuthenticationError, StromerAccount, StromerToken
 
 SCAN_INTERVAL = timedelta(minutes=10)
+HISTORY_FLUSH_INTERVAL = timedelta(minutes=15)
 
 PLATFORMS: list[Platform] = [
     Platform.BINARY_SENSOR,
@@ -26,7 +55,7 @@ PLATFORMS: list[Platform] = [
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Stromer from a config entry."""
     hass.data.setdefault(DOMAIN, {})
-    LOGGER.debug(f"Stromer entry: {entry}")
+    LOGGER.debug("Stromer entry: %s", entry)
 
     # Fetch configuration data from config_flow
     username = entry.data[CONF_USERNAME]
@@ -34,20 +63,30 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     client_id = entry.data[CONF_CLIENT_ID]
     client_secret = entry.data.get(CONF_CLIENT_SECRET, None)
 
-    # Initialize module
-    stromer = Stromer(username, password, client_id, client_secret)
+    # Share one account (session and token) between all bikes of the same user, including
+    # the account logged in by the config flow
+    accounts: dict[str, StromerAccount] = hass.data[DOMAIN].setdefault(ACCOUNTS, {})
+    account_key = get_account_key(entry.data)
+    if (account := accounts.get(account_key)) is None:
+        account = accounts[account_key] = StromerAccount(username, password, client_id, client_secret)
+    elif not account.uses_credentials(username, password, client_id, client_secret):
+        # Credentials changed (e.g. by adding a bike with a new password), use the ones of this entry
+        account.update_credentials(password, client_secret)
 
-    # Setup connection to stromer
-    try:
-        await stromer.stromer_connect()
-    except ApiError as ex:
-        raise ConfigEntryNotReady("Error while communicating to Stromer API") from ex
-    except NextLocationError as ex:
-        raise ConfigEntryNotReady("Error while getting authentication location %s", ex) from ex
+    # Reuse the token of the previous run, only logging in when it can not be used or refreshed
+    if token_data := entry.data.get(CONF_TOKEN):
+        account.restore_token(token_data)
+
+    @callback  # type: ignore[misc]
+    def _async_store_token(token: StromerToken) -> None:
+        _async_update_token(hass, account_key, token)
+
+    account.token_callback = _async_store_token
 
     # Ensure migration from v3 single bike
     if "bike_id" not in entry.data:
-        bikedata = await stromer.stromer_detect()
+        await _async_connect(hass, account, account_key)
+        bikedata = await account.stromer_detect()
         new_data = {
             **entry.data,
             "bike_id": bikedata[0]["bikeid"],
@@ -57,48 +96,173 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.config_entries.async_update_entry(entry, data=new_data)
 
     # Set specific bike (instead of all bikes) introduced with morebikes PR
-    stromer.bike_id = entry.data["bike_id"]
-    stromer.bike_name = entry.data["nickname"]
-    stromer.bike_model = entry.data["model"]
+    stromer = account.get_bike(entry.data["bike_id"], entry.data["nickname"], entry.data["model"])
+    stromer.payload_logger.mode = entry.options.get(CONF_PAYLOAD_LOGGING, DEFAULT_PAYLOAD_LOGGING)
 
     # Use Bike ID as unique id
     if entry.unique_id is None or entry.unique_id == "stromerbike":
         hass.config_entries.async_update_entry(entry, unique_id=f"stromerbike-{stromer.bike_id}")
 
+    # Keep a compact telemetry history on disk (unless disabled)
+    history = None
+    if retention := entry.options.get(CONF_HISTORY_RETENTION, DEFAULT_HISTORY_RETENTION):
+        history = StromerHistory(hass, stromer.bike_id, retention)
+
+    # Import the bike totals as hourly long-term statistics, backfilled from the history
+    statistics = None
+    if "recorder" in hass.config.components:
+        from .statistics import StromerStatistics  # noqa: PLC0415
+
+        statistics = StromerStatistics(hass, stromer.bike_id, stromer.bike_name)
+
     # Set up coordinator for fetching data
-    coordinator = StromerDataUpdateCoordinator(hass, stromer, SCAN_INTERVAL)  # type: ignore[arg-type]
-    await coordinator.async_config_entry_first_refresh()
+    coordinator = StromerDataUpdateCoordinator(
+        hass,
+        stromer,
+        SCAN_INTERVAL,
+        timedelta(seconds=entry.options.get(CONF_INTERVAL_MOVING, DEFAULT_INTERVAL_MOVING)),
+        timedelta(seconds=entry.options.get(CONF_INTERVAL_PARKED, DEFAULT_INTERVAL_PARKED)),
+        interval_state=timedelta(seconds=entry.options.get(CONF_INTERVAL_STATE, DEFAULT_INTERVAL_STATE)),
+        history=history,
+        snapshot=_snapshot_store(hass, stromer.bike_id),
+        statistics=statistics,
+    )
+    if await coordinator.async_restore_snapshot():
+        # Start from the last known data, logging in and refreshing in the background
+        entry.async_create_background_task(hass, coordinator.async_refresh(), f"{DOMAIN} {stromer.bike_id} refresh")
+    else:
+        try:
+            await _async_connect(hass, account, account_key)
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            account.release_bike(stromer.bike_id)
+            await async_release_account(hass, account_key)
+            raise
 
     # Store coordinator for use in platforms
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
-    # Add bike to the HA device registry
+    # Add bike to the HA device registry, entities only refer to it by its identifier
     device_registry = dr.async_get(hass)
+    state = coordinator.data.bikedata
     device = device_registry.async_get_or_create(
         config_entry_id=entry.entry_id,
         identifiers={(DOMAIN, str(stromer.bike_id))},
         manufacturer="Stromer",
         name=stromer.bike_name,
         model=stromer.bike_model,
+        sw_version=state.suiversion,
+        hw_version=state.tntversion,
     )
 
     # Remove non-existing via device
-    device_registry.async_update_device(
-        device.id,
-        name=stromer.bike_name,
-        model=stromer.bike_model,
-        via_device_id=None,
-    )
+    if device.via_device_id is not None:
+        device_registry.async_update_device(device.id, via_device_id=None)
+
+    # Only update the registry when the firmware versions reported by the bike change
+    versions = (device.sw_version, device.hw_version)
+
+    @callback  # type: ignore[misc]
+    def _async_update_device() -> None:
+        nonlocal versions
+        state = coordinator.data.bikedata
+        if (state.suiversion, state.tntversion) == versions:
+            return
+        versions = (state.suiversion, state.tntversion)
+        LOGGER.debug("Stromer firmware of %s changed to %s", stromer.bike_id, versions)
+        device_registry.async_update_device(device.id, sw_version=state.suiversion, hw_version=state.tntversion)
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_update_device))
 
     # Set up platforms (i.e. sensors, binary_sensors)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Reload to apply changed options (i.e. polling intervals), but not for a stored token
+    options = dict(entry.options)
+
+    async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+        if entry.options != options:
+            await hass.config_entries.async_reload(entry.entry_id)
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
+
+    # Close the session when Home Assistant stops, as entries are not unloaded then
+    async def _async_disconnect(_: Event) -> None:
+        await account.stromer_disconnect()
+
+    entry.async_on_unload(hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_disconnect))
+
+    # Write the buffered history regularly, when unloading and when Home Assistant stops
+    if history is not None:
+
+        async def _async_flush_history(_: Any) -> None:
+            await history.async_flush()
+
+        entry.async_on_unload(async_track_time_interval(hass, _async_flush_history, HISTORY_FLUSH_INTERVAL))
+        entry.async_on_unload(hass.bus.async_listen_once(EVENT_HOMEASSISTANT_FINAL_WRITE, _async_flush_history))
+        entry.async_on_unload(history.async_flush)
+
+        if statistics is not None:
+            entry.async_create_background_task(
+                hass, statistics.async_backfill(history), f"{DOMAIN} {stromer.bike_id} statistics backfill"
+            )
+
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        account_key = get_account_key(entry.data)
+        hass.data[DOMAIN][ACCOUNTS][account_key].release_bike(coordinator.stromer.bike_id)
+        await async_release_account(hass, account_key)
 
     return unload_ok  # type: ignore [no-any-return]
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored snapshot and history of a removed config entry."""
+    if "bike_id" in entry.data:
+        await _snapshot_store(hass, entry.data["bike_id"]).async_remove()
+        await StromerHistory(hass, entry.data["bike_id"], 0).async_remove()
+
+
+async def _async_connect(hass: HomeAssistant, account: StromerAccount, account_key: str) -> None:
+    """Connect to the Stromer API, releasing the account when that fails."""
+    try:
+        await account.stromer_connect()
+    except ApiError as ex:
+        await async_release_account(hass, account_key)
+        raise ConfigEntryNotReady("Error while communicating to Stromer API") from ex
+    except AuthenticationError as ex:
+        await async_release_account(hass, account_key)
+        raise ConfigEntryAuthFailed(f"Login rejected by Stromer API: {ex}") from ex
+
+
+def _snapshot_store(hass: HomeAssistant, bike_id: str) -> Store:
+    """Return the store holding the last known data of a bike."""
+    return Store(hass, SNAPSHOT_VERSION, f"{DOMAIN}.{bike_id}.snapshot")
+
+
+@callback  # type: ignore[misc]
+def _async_update_token(hass: HomeAssistant, account_key: str, token: StromerToken) -> None:
+    """Store a newly issued token with all config entries of the account."""
+    token_data = token.as_dict()
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if get_account_key(entry.data) == account_key and entry.data.get(CONF_TOKEN) != token_data:
+            hass.config_entries.async_update_entry(entry, data={**entry.data, CONF_TOKEN: token_data})
+
+
+def get_account_key(data: Mapping[str, Any]) -> str:
+    """Return the key identifying the Stromer account of config entry data."""
+    return f"{data[CONF_USERNAME]}-{data[CONF_CLIENT_ID]}"
+
+
+async def async_release_account(hass: HomeAssistant, account_key: str) -> None:
+    """Disconnect and forget an account once no bike is using it anymore."""
+    accounts: dict[str, StromerAccount] = hass.data[DOMAIN][ACCOUNTS]
+    account = accounts.get(account_key)
+    if account is not None and not account.in_use:
+        await account.stromer_disconnect()
+        accounts.pop(account_key)
@@ -4,6 +4,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
     BinarySensorEntity,
     BinarySensorEntityDescription,
 )
@@ -12,9 +13,9 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, LOGGER
+from .const import DOMAIN
 from .coordinator import StromerDataUpdateCoordinator
-from .entity import StromerEntity
+from .entity import StromerEntity, async_add_stromer_entities
 
 
 @dataclass
@@ -48,23 +49,28 @@ BINARY_SENSORS: tuple[StromerBinarySensorEntityDescription, ...] = (
     ),
 )
 
+RIDING_BINARY_SENSOR = StromerBinarySensorEntityDescription(
+    key="riding",
+    translation_key="riding",
+    device_class=BinarySensorDeviceClass.MOVING,
+    icon="mdi:bicycle-electric",
+    icon_off="mdi:bicycle",
+)
+
 
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
     """Set up the Stromer sensors from a config entry."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
 
-    entities = []
-    for idx, data in enumerate(coordinator.data.bikedata.items()):
-        for description in BINARY_SENSORS:
-            if data[0] == description.key:
-                entities.append(
-                    StromerBinarySensor(coordinator, idx, data, description)
-                )
-                LOGGER.debug(
-                    "Add %s %s binary_sensor", data, description.translation_key
-                )
+    async_add_stromer_entities(
+        coordinator,
+        config_entry,
+        async_add_entities,
+        BINARY_SENSORS,
+        lambda description: StromerBinarySensor(coordinator, description),
+    )
 
-    async_add_entities(entities, update_before_add=False)
+    async_add_entities([StromerRidingBinarySensor(coordinator, RIDING_BINARY_SENSOR)], update_before_add=False)
 
 
 class StromerBinarySensor(StromerEntity, BinarySensorEntity):  # type: ignore[misc]
@@ -77,13 +83,11 @@ class StromerBinarySensor(StromerEntity, BinarySensorEntity):  # type: ignore[mi
     def __init__(
         self,
         coordinator: StromerDataUpdateCoordinator,
-        idx: int,
-        data: dict,
         description: BinarySensorEntityDescription,
     ):
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self._ent = data[0]
+        self._ent = description.key
         self._coordinator = coordinator
 
         device_id = coordinator.data.bike_id
@@ -94,4 +98,13 @@ class StromerBinarySensor(StromerEntity, BinarySensorEntity):  # type: ignore[mi
     @property
     def is_on(self) -> bool | None:
         """Return true if the binary sensor is on."""
-        return self._coordinator.data.bikedata.get(self._ent)  # type: ignore[no-any-return]
+        return getattr(self._coordinator.data.bikedata, self._ent)  # type: ignore[no-any-return]
+
+
+class StromerRidingBinarySensor(StromerBinarySensor):
+    """Representation of the ride detection Binary Sensor."""
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return true if the bike is being ridden."""
+        return self._coordinator.rides.riding
@@ -10,9 +10,9 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, LOGGER
+from .const import DOMAIN
 from .coordinator import StromerDataUpdateCoordinator
-from .entity import StromerEntity
+from .entity import StromerEntity, async_add_stromer_entities
 
 BUTTONS: tuple[ButtonEntityDescription, ...] = (
     ButtonEntityDescription(
@@ -27,14 +27,13 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry, asyn
     """Set up the Stromer Buttons from a config entry."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
 
-    entities = []
-    for idx, data in enumerate(coordinator.data.bikedata.items()):
-        for description in BUTTONS:
-            if data[0] == description.key:
-                entities.append(StromerButton(coordinator, idx, data, description))
-                LOGGER.debug("Add %s %s button", data, description.translation_key)
-
-    async_add_entities(entities, update_before_add=False)
+    async_add_stromer_entities(
+        coordinator,
+        config_entry,
+        async_add_entities,
+        BUTTONS,
+        lambda description: StromerButton(coordinator, description),
+    )
 
 
 class StromerButton(StromerEntity, ButtonEntity):  # type: ignore[misc]
@@ -47,13 +46,11 @@ class StromerButton(StromerEntity, ButtonEntity):  # type: ignore[misc]
     def __init__(
         self,
         coordinator: StromerDataUpdateCoordinator,
-        idx: int,
-        data: dict,
         description: ButtonEntityDescription,
     ):
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self._ent = data[0]
+        self._ent = description.key
         self._coordinator = coordinator
 
         device_id = coordinator.data.bike_id
@@ -64,4 +61,4 @@ class StromerButton(StromerEntity, ButtonEntity):  # type: ignore[misc]
     async def async_press(self) -> None:
         """Handle the button press."""
         if self.entity_description.key == "trip_distance":
-            await self._coordinator.stromer.stromer_reset_trip_data()
+            await self._coordinator.async_send_command("reset_trip_data")
@@ -1,18 +1,46 @@
 """Config flow for Stromer integration."""
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Any
 
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_PASSWORD, CONF_TOKEN, CONF_USERNAME
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import BIKE_DETAILS, CONF_CLIENT_ID, CONF_CLIENT_SECRET, DOMAIN, LOGGER
-from .stromer import ApiError, NextLocationError, Stromer
+from . import async_release_account, get_account_key
+from .const import (
+    ACCOUNTS,
+    BIKE_DETAILS,
+    CONF_CLIENT_ID,
+    CONF_CLIENT_SECRET,
+    CONF_HISTORY_RETENTION,
+    CONF_INTERVAL_MOVING,
+    CONF_INTERVAL_PARKED,
+    CONF_INTERVAL_STATE,
+    CONF_PAYLOAD_LOGGING,
+    DEFAULT_HISTORY_RETENTION,
+    DEFAULT_INTERVAL_MOVING,
+    DEFAULT_INTERVAL_PARKED,
+    DEFAULT_INTERVAL_STATE,
+    DEFAULT_PAYLOAD_LOGGING,
+    DOMAIN,
+    LOGGER,
+)
+from .stromer import (
+    PAYLOAD_LOGGING_MODES,
+    ApiError,
+    AuthenticationError,
+    StromerAccount,
+    redact_payload,
+)
+
+# Reuse a recently fetched bike list, i.e. when adding several bikes of one account
+INVENTORY_MAX_AGE = 300  # seconds
 
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
@@ -24,21 +52,40 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
 )
 
 
-async def validate_input(_: HomeAssistant, data: dict[str, Any]) -> dict:
-    """Validate the user input allows us to connect by returning a dictionary with all bikes under the account."""
+async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict:
+    """Validate the user input allows us to connect by returning a dictionary with all bikes under the account.
+
+    The logged in account is kept (shared with the entries of the same account), so
+    setting up the new entry does not log in again.
+    """
     username = data[CONF_USERNAME]
     password = data[CONF_PASSWORD]
     client_id = data[CONF_CLIENT_ID]
     client_secret = data.get(CONF_CLIENT_SECRET, None)
 
-    # Initialize connection to stromer to validate credentials
+    accounts: dict[str, StromerAccount] = hass.data.setdefault(DOMAIN, {}).setdefault(ACCOUNTS, {})
+    account_key = get_account_key(data)
+    stromer = accounts.get(account_key)
+    if (
+        stromer is None
+        or stromer.auth_rejected
+        or not stromer.uses_credentials(username, password, client_id, client_secret)
+    ):
+        if stromer is not None and not stromer.in_use:
+            await async_release_account(hass, account_key)
+        stromer = StromerAccount(username, password, client_id, client_secret)
+
+    # Initialize connection to stromer to validate credentials (unless already logged in)
     try:
-        stromer = Stromer(username, password, client_id, client_secret)
         connected: bool = await stromer.stromer_connect()
     except ApiError as ex:
+        if accounts.get(account_key) is not stromer:
+            await stromer.stromer_disconnect()
         raise CannotConnect("Error while connecting to Stromer API %s", ex) from ex
-    except NextLocationError as ex:
-        raise CannotConnect("Error while getting authentication location %s", ex) from ex
+    except AuthenticationError as ex:
+        if accounts.get(account_key) is not stromer:
+            await stromer.stromer_disconnect()
+        raise InvalidAuth("Login rejected by Stromer API %s", ex) from ex
 
     if not connected:
         raise InvalidAuth
@@ -46,9 +93,20 @@ async def validate_input(_: HomeAssistant, data: dict[str, Any]) -> dict:
     LOGGER.debug("Credentials validated successfully")
 
     # All bikes information available
-    all_bikes = await stromer.stromer_detect()
-
-    await stromer.stromer_disconnect()
+    all_bikes = await stromer.stromer_detect(max_age=INVENTORY_MAX_AGE)
+    configured = {str(entry.data.get("bike_id")) for entry in hass.config_entries.async_entries(DOMAIN)}
+    if all(str(bike["bikeid"]) in configured for bike in all_bikes):
+        # Nothing new in the cached list, fetch it again in case a bike was added to the account
+        stromer.invalidate_inventory()
+        all_bikes = await stromer.stromer_detect()
+
+    # Keep the session for the new entry. When the entries of the account use other
+    # (outdated) credentials, the validated ones replace them.
+    if accounts.setdefault(account_key, stromer) is not stromer:
+        await stromer.stromer_disconnect()
+        _async_update_credentials(hass, data)
+    elif token_data := stromer.token_data:
+        data[CONF_TOKEN] = token_data
 
     return all_bikes
 
@@ -58,6 +116,20 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ignore[call
 
     VERSION = 1
 
+    @staticmethod
+    @callback  # type: ignore[misc]
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
+    @callback  # type: ignore[misc]
+    def async_remove(self) -> None:
+        """Release the account logged in by this flow, unless an entry is using it."""
+        if (user_input := getattr(self, "user_input_data", None)) is not None:
+            self.hass.async_create_task(async_release_account(self.hass, get_account_key(user_input)))
+
     async def async_step_bike(
         self, user_input: dict[str, Any] | None = None,
     ) -> FlowResult:
@@ -78,12 +150,12 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ignore[call
         self.user_input_data["nickname"] = nickname
         self.user_input_data["model"] = self.all_bikes[bike_id]["biketype"]
 
-        LOGGER.info(f"Using {selected_bike} (i.e. bike ID {bike_id}) to talk to the Stromer API")
+        LOGGER.info("Using %s (i.e. bike ID %s) to talk to the Stromer API", selected_bike, bike_id)
 
         await self.async_set_unique_id(f"stromerbike-{bike_id}")
         self._abort_if_unique_id_configured()
 
-        LOGGER.info(f"Creating entry using {nickname} as bike device name")
+        LOGGER.info("Creating entry using %s as bike device name", nickname)
         return self.async_create_entry(title=nickname, data=self.user_input_data)
 
     async def async_step_user(
@@ -99,7 +171,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ignore[call
 
         try:
             bikes_data = await validate_input(self.hass, user_input)
-            LOGGER.debug(f"bikes_data contains {bikes_data}")
+            LOGGER.debug("bikes_data contains %s", redact_payload(bikes_data))
 
             # Retrieve any bikes available within account
             # Modify output for better display of selection
@@ -107,7 +179,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ignore[call
             self.all_bikes = {}
             LOGGER.debug("Checking available bikes:")
             for bike in bikes_data:
-               LOGGER.debug(f"* this bike contains {bike}")
+               LOGGER.debug("* this bike contains %s", redact_payload(bike))
                bike_id = bike["bikeid"]
                nickname = bike["nickname"]
                biketype = bike["biketype"]
@@ -133,6 +205,113 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ignore[call
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
 
+    async def async_step_reauth(self, entry_data: Mapping[str, Any]) -> FlowResult:
+        """Handle a login rejected by the Stromer API."""
+        self._reauth_entry = self.hass.config_entries.async_get_entry(self.context["entry_id"])
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Ask for the new password of the account."""
+        entry = self._reauth_entry
+        errors = {}
+
+        if user_input is not None:
+            data = {**entry.data, CONF_PASSWORD: user_input[CONF_PASSWORD]}
+            data.pop(CONF_TOKEN, None)
+            try:
+                await validate_input(self.hass, data)
+            except CannotConnect:
+                errors["base"] = "cannot_connect"
+            except InvalidAuth:
+                errors["base"] = "invalid_auth"
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception("Unexpected exception")
+                errors["base"] = "unknown"
+            else:
+                _async_update_credentials(self.hass, data)
+                for other in self.hass.config_entries.async_entries(DOMAIN):
+                    if get_account_key(other.data) == get_account_key(data):
+                        self.hass.config_entries.async_schedule_reload(other.entry_id)
+                return self.async_abort(reason="reauth_successful")
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=vol.Schema({vol.Required(CONF_PASSWORD): str}),
+            errors=errors,
+            description_placeholders={"username": entry.data[CONF_USERNAME]},
+        )
+
+
+@callback  # type: ignore[misc]
+def _async_update_credentials(hass: HomeAssistant, data: dict[str, Any]) -> None:
+    """Use validated credentials for the shared account and store them with all its bikes."""
+    account_key = get_account_key(data)
+    if (account := hass.data[DOMAIN].get(ACCOUNTS, {}).get(account_key)) is not None:
+        account.update_credentials(data[CONF_PASSWORD], data.get(CONF_CLIENT_SECRET))
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if get_account_key(entry.data) != account_key:
+            continue
+        new_data = {**entry.data, CONF_PASSWORD: data[CONF_PASSWORD]}
+        if data.get(CONF_CLIENT_SECRET):
+            new_data[CONF_CLIENT_SECRET] = data[CONF_CLIENT_SECRET]
+        else:
+            new_data.pop(CONF_CLIENT_SECRET, None)
+        if CONF_TOKEN in data:
+            new_data[CONF_TOKEN] = data[CONF_TOKEN]
+        if new_data != entry.data:
+            hass.config_entries.async_update_entry(entry, data=new_data)
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):  # type: ignore[misc]
+    """Handle Stromer options."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the polling intervals."""
+        errors = {}
+
+        if user_input is not None:
+            if user_input[CONF_INTERVAL_MOVING] > user_input[CONF_INTERVAL_PARKED]:
+                errors["base"] = "invalid_interval"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        STEP_INIT_DATA_SCHEMA = vol.Schema(
+            {
+                vol.Required(
+                    CONF_INTERVAL_MOVING,
+                    default=options.get(CONF_INTERVAL_MOVING, DEFAULT_INTERVAL_MOVING),
+                ): vol.All(vol.Coerce(int), vol.Range(min=30, max=3600)),
+                vol.Required(
+                    CONF_INTERVAL_PARKED,
+                    default=options.get(CONF_INTERVAL_PARKED, DEFAULT_INTERVAL_PARKED),
+                ): vol.All(vol.Coerce(int), vol.Range(min=60, max=86400)),
+                vol.Required(
+                    CONF_INTERVAL_STATE,
+                    default=options.get(CONF_INTERVAL_STATE, DEFAULT_INTERVAL_STATE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=30, max=86400)),
+                vol.Required(
+                    CONF_PAYLOAD_LOGGING,
+                    default=options.get(CONF_PAYLOAD_LOGGING, DEFAULT_PAYLOAD_LOGGING),
+                ): vol.In(PAYLOAD_LOGGING_MODES),
+                vol.Required(
+                    CONF_HISTORY_RETENTION,
+                    default=options.get(CONF_HISTORY_RETENTION, DEFAULT_HISTORY_RETENTION),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3650)),
+            }
+        )
+        return self.async_show_form(
+            step_id="init", data_schema=STEP_INIT_DATA_SCHEMA, errors=errors
+        )
+
 
 class CannotConnect(HomeAssistantError):  # type: ignore[misc]
     """Error to indicate we cannot connect."""
@@ -6,9 +6,24 @@ DOMAIN = "stromer"
 LOGGER = logging.getLogger(__name__)
 
 COORDINATOR = "coordinator"
+ACCOUNTS = "accounts"
 
 CONF_CLIENT_ID = "client_id"
 CONF_CLIENT_SECRET = "client_secret"
 
 BIKE_DETAILS = "bike_details"
 
+
+CONF_INTERVAL_MOVING = "interval_moving"
+CONF_INTERVAL_PARKED = "interval_parked"
+CONF_INTERVAL_STATE = "interval_state"
+
+DEFAULT_INTERVAL_MOVING = 60  # seconds
+DEFAULT_INTERVAL_PARKED = 3600  # seconds
+DEFAULT_INTERVAL_STATE = 300  # seconds
+
+CONF_PAYLOAD_LOGGING = "payload_logging"
+DEFAULT_PAYLOAD_LOGGING = "full"
+
+CONF_HISTORY_RETENTION = "history_retention"
+DEFAULT_HISTORY_RETENTION = 90  # days, 0 disables the history
@@ -1,18 +1,129 @@
 """DataUpdateCoordinator for Stromer."""
-from typing import Any, NamedTuple
+from __future__ import annotations
 
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, fields
+from datetime import UTC, datetime, timedelta
+import json
+import logging
+import time
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import aiohttp
 from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .const import DOMAIN, LOGGER
-from .stromer import ApiError, NextLocationError, Stromer
+from .forecast import RangeForecast
+from .history import StromerHistory
+from .rides import RideTracker
+from .stromer import ApiError, AuthenticationError, Stromer
+
+if TYPE_CHECKING:
+    from .statistics import StromerStatistics
+
+
+def _timestamp(value: Any) -> datetime:
+    """Convert an epoch timestamp from the API."""
+    return datetime.fromtimestamp(int(value), tz=UTC)
+
+
+# Conversion of API values needing more than the JSON decoded type
+CONVERTERS: dict[str, Callable[[Any], Any]] = {
+    "rcvts": _timestamp,
+    "rcvts_pos": _timestamp,
+    "timets": _timestamp,
+    "latitude": float,
+    "longitude": float,
+    "light_on": bool,
+    "lock_flag": bool,
+    "theft_flag": bool,
+}
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class BikeState:
+    """Typed snapshot of the bike state and position of a single refresh."""
+
+    keys: frozenset[str] = frozenset()
+    bike_name: str | None = None
+    bike_model: str | None = None
+    suiversion: str | None = None
+    tntversion: str | None = None
+    assistance_level: float | None = None
+    atmospheric_pressure: float | None = None
+    average_energy_consumption: float | None = None
+    average_speed_total: float | None = None
+    average_speed_trip: float | None = None
+    battery_SOC: float | None = None  # noqa: N815
+    battery_health: float | None = None
+    battery_temp: float | None = None
+    bike_speed: float | None = None
+    motor_temp: float | None = None
+    power_on_cycles: int | None = None
+    speed: float | None = None
+    total_distance: float | None = None
+    total_energy_consumption: float | None = None
+    total_time: int | None = None
+    trip_distance: float | None = None
+    trip_time: int | None = None
+    light_on: bool | None = None
+    lock_flag: bool | None = None
+    theft_flag: bool | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+    rcvts: datetime | None = None
+    rcvts_pos: datetime | None = None
+    timets: datetime | None = None
+
+    @classmethod
+    def from_payloads(
+        cls, status: dict[str, Any], position: dict[str, Any], bike_name: str | None, bike_model: str | None
+    ) -> BikeState:
+        """Build the state from the raw status and position payloads."""
+        values: dict[str, Any] = {"bike_name": bike_name, "bike_model": bike_model}
+        values.update(status)
+        # Rewrite position["rcvts"] as this key exists in status
+        values.update(("rcvts_pos" if key == "rcvts" else key, value) for key, value in position.items())
+
+        kwargs: dict[str, Any] = {}
+        for key in FIELDS.intersection(values):
+            value = values[key]
+            if value is not None and key in CONVERTERS:
+                value = CONVERTERS[key](value)
+            kwargs[key] = value
+        return cls(keys=frozenset(kwargs), **kwargs)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the present values as a dictionary."""
+        return {key: getattr(self, key) for key in sorted(self.keys)}
+
+
+FIELDS = frozenset(field.name for field in fields(BikeState)) - {"keys"}
+
+
+# Bounded state-only polling confirming a command took effect
+CONFIRM_ATTEMPTS = 5
+CONFIRM_DELAY = 2
+
+# Commands changing a bike state field that is confirmed after a burst
+CONFIRMED_COMMANDS = ("lock_flag", "light_on")
+
+# Allowed scheduling jitter (in seconds) when checking whether the state is due
+STATE_DUE_SLACK = 5
+
+# Last known payloads, restored on startup before the API is reachable
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 60  # seconds
 
 
 class StromerData(NamedTuple):
     """Stromer data stored in the DataUpdateCoordinator."""
 
-    bikedata: dict[str, Any]
+    bikedata: BikeState
     bike_id: str
     bike_name: str
 
@@ -20,32 +131,261 @@ class StromerData(NamedTuple):
 class StromerDataUpdateCoordinator(DataUpdateCoordinator[StromerData]):  # type: ignore[misc]
     """Class to manage fetching Stromer data from single endpoint."""
 
-    def __init__(self, hass: HomeAssistant, stromer: Stromer, interval: float) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        stromer: Stromer,
+        interval: timedelta,
+        interval_moving: timedelta,
+        interval_parked: timedelta,
+        *,
+        interval_state: timedelta | None = None,
+        history: StromerHistory | None = None,
+        snapshot: Store | None = None,
+        statistics: StromerStatistics | None = None,
+    ) -> None:
         """Initialize the coordinator."""
-        super().__init__(hass, LOGGER, name=DOMAIN, update_interval=interval)
+        super().__init__(hass, LOGGER, name=DOMAIN, update_interval=interval, always_update=False)
         self.stromer = stromer
+        self.history = history
+        self.snapshot = snapshot
+        self.statistics = statistics
+        self.rides = RideTracker()
+        self.forecast = RangeForecast()
+
+        # Fingerprint of the last raw state and position payloads
+        self._fingerprint: int | None = None
+        self.skipped_refreshes = 0
+
+        # Poll faster while riding and slower while the bike is parked
+        self.interval_moving = interval_moving
+        self.interval_parked = interval_parked
+        self.interval_default = min(max(interval, interval_moving), interval_parked)
+        self._last_location: tuple[float | None, float | None] | None = None
+        self._last_rcvts: datetime | None = None
+
+        # The position follows the refresh interval, the state is fetched at most every interval_state
+        self.interval_state = interval_state
+        self._state_fetched: float | None = None
+
+        # Pending commands (latest value and waiting callers) and the task running them
+        self._commands: dict[str, tuple[Any, list[asyncio.Future[bool]]]] = {}
+        self._command_task: asyncio.Task[None] | None = None
+
+    def _adapt_update_interval(self, state: BikeState) -> None:
+        """Choose the next polling interval based on motion and lock state."""
+        location = (state.latitude, state.longitude)
+        rcvts = state.rcvts
+        moved = self._last_location is not None and location != self._last_location
+        pushed = self._last_rcvts is not None and rcvts != self._last_rcvts
+        self._last_location = location
+        self._last_rcvts = rcvts
+
+        if moved or state.bike_speed or state.speed:
+            interval = self.interval_moving
+        elif state.lock_flag and not pushed:
+            interval = self.interval_parked
+        else:
+            interval = self.interval_default
+
+        if interval != self.update_interval:
+            LOGGER.debug("Stromer update interval changed to %s", interval)
+            self.update_interval = interval
+
+    async def async_restore_snapshot(self) -> bool:
+        """Restore the data of the last refresh before a restart, if stored."""
+        if self.snapshot is None or not (stored := await self.snapshot.async_load()):
+            return False
+        self.stromer.status = stored["status"]
+        self.stromer.position = stored["position"]
+        self._fingerprint = self._payload_fingerprint()
+        self.data = self._build_data()
+        if forecast := stored.get("forecast"):
+            self.forecast.restore(forecast)
+            self.forecast.update(self.data.bikedata)
+        LOGGER.debug("Stromer data restored with %s fields", len(self.data.bikedata.keys))
+        return True
+
+    def _snapshot_data(self) -> dict[str, Any]:
+        """Return the payloads (and forecast state) to store as snapshot."""
+        return {"status": self.stromer.status, "position": self.stromer.position, "forecast": self.forecast.as_dict()}
+
+    def _track_ride(self, state: BikeState) -> bool:
+        """Update ride detection and derived metrics, firing ride events."""
+        events = self.rides.update(state, datetime.now(tz=UTC))
+        for event_type, event_data in events:
+            LOGGER.debug("Stromer %s %s", self.stromer.bike_id, event_type)
+            self.hass.bus.async_fire(event_type, {"bike_id": self.stromer.bike_id, **event_data})
+        return bool(events)
+
+    def _state_due(self) -> bool:
+        """Return whether the bike state should be fetched in this refresh."""
+        if self.interval_state is None or self._state_fetched is None or not self.stromer.status:
+            return True
+        elapsed = time.monotonic() - self._state_fetched
+        return elapsed >= self.interval_state.total_seconds() - STATE_DUE_SLACK
+
+    def _payload_fingerprint(self) -> int:
+        """Return a fingerprint of the last fetched raw payloads."""
+        return hash(json.dumps([self.stromer.status, self.stromer.position], sort_keys=True, default=str))
+
+    def _build_data(self) -> StromerData:
+        """Build the coordinator data from the last fetched payloads."""
+        state = BikeState.from_payloads(
+            self.stromer.status, self.stromer.position, self.stromer.bike_name, self.stromer.bike_model
+        )
+        return StromerData(state, self.stromer.bike_id, self.stromer.bike_name)  # type: ignore[arg-type]
+
+    async def async_send_command(self, command: str, value: Any = None) -> bool:
+        """Queue a command for the bike and wait until it is sent and confirmed.
+
+        Commands run one at a time in order. A command queued again before it
+        was sent only keeps its latest value, and a single confirmation follows
+        each burst of commands. Returns whether the bike state was confirmed.
+        """
+        future: asyncio.Future[bool] = self.hass.loop.create_future()
+        _previous, futures = self._commands.get(command, (None, []))
+        futures.append(future)
+        self._commands[command] = (value, futures)
+
+        if self._command_task is None or self._command_task.done():
+            name = f"{DOMAIN} {self.stromer.bike_id} commands"
+            if self.config_entry is not None:
+                # Cancelled when the entry is unloaded, so no command is sent for a bike that is gone
+                self._command_task = self.config_entry.async_create_background_task(
+                    self.hass, self._async_run_commands(), name
+                )
+            else:
+                self._command_task = self.hass.async_create_background_task(self._async_run_commands(), name)
+        return await future
+
+    async def _async_run_commands(self) -> None:
+        """Send queued commands in order, confirming the bike state after each burst."""
+        try:
+            while self._commands:
+                expected: dict[str, Any] = {}
+                sent: list[asyncio.Future[bool]] = []
+                try:
+                    while self._commands:
+                        command = next(iter(self._commands))
+                        value, futures = self._commands.pop(command)
+                        sent.extend(futures)
+                        try:
+                            await self._async_execute_command(command, value)
+                        except Exception as ex:
+                            LOGGER.error("Stromer command %s failed: %s", command, ex)
+                            _resolve(futures, exception=ex)
+                            continue
+                        if command in CONFIRMED_COMMANDS:
+                            expected[command] = value
+
+                    if any(not future.done() for future in sent):
+                        _resolve(sent, result=await self.async_confirm_state(expected))
+                except Exception as ex:
+                    LOGGER.error("Stromer confirmation of %s failed: %s", expected, ex)
+                    _resolve(sent, exception=ex)
+                finally:
+                    # Never leave a caller waiting, also when the task is cancelled
+                    _resolve(sent, exception=HomeAssistantError("Stromer command was not confirmed"))
+        except asyncio.CancelledError:
+            # Drop the commands not sent yet, e.g. when the entry is unloaded
+            for _value, futures in self._commands.values():
+                _resolve(futures, exception=HomeAssistantError("Stromer command was cancelled"))
+            self._commands.clear()
+            raise
+
+    async def _async_execute_command(self, command: str, value: Any) -> None:
+        """Send a single command to the API."""
+        LOGGER.debug("Stromer sending command %s %s", command, value)
+        if command == "lock_flag":
+            await self.stromer.stromer_call_lock(value)
+        elif command == "light_on":
+            await self.stromer.stromer_call_light("on" if value else "off")
+        elif command == "reset_trip_data":
+            await self.stromer.stromer_reset_trip_data()
+        else:
+            raise ValueError(f"Unknown command {command}")
+
+    async def async_confirm_state(self, expected: dict[str, Any]) -> bool:
+        """Poll the bike state until its fields match the expected values.
+
+        Only the state endpoint is queried, at most CONFIRM_ATTEMPTS times. On a
+        match the entities are updated with the new state and True is returned.
+        """
+        for attempt in range(1, CONFIRM_ATTEMPTS + 1):
+            await asyncio.sleep(CONFIRM_DELAY)
+            try:
+                await self.stromer.stromer_update_status()
+            except (ApiError, AuthenticationError) as ex:
+                LOGGER.debug("Stromer confirmation of %s failed: %s", expected, ex)
+                continue
+
+            self._state_fetched = time.monotonic()
+            data = self._build_data()
+            if all(getattr(data.bikedata, key) == value for key, value in expected.items()):
+                LOGGER.debug("Stromer %s confirmed after %s polls", expected, attempt)
+                self._fingerprint = self._payload_fingerprint()
+                self.async_set_updated_data(data)
+                return True
+
+        LOGGER.warning("Stromer state did not change to %s", expected)
+        return False
 
     async def _async_update_data(self) -> StromerData:
         """Fetch data from Stromer."""
+        fetch_status = self._state_due()
         try:
-            await self.stromer.stromer_update()
+            await self.stromer.stromer_update(status=fetch_status)
+        except AuthenticationError as ex:
+            raise ConfigEntryAuthFailed(f"Login rejected by Stromer API: {ex}") from ex
+        except (ApiError, aiohttp.ClientError, TimeoutError) as ex:
+            raise UpdateFailed(f"Error communicating with API: {ex}") from ex
+        if fetch_status:
+            self._state_fetched = time.monotonic()
 
-            # Rewrite position["rcvts"] as this key exists in status
-            if "rcvts" in self.stromer.position:
-                self.stromer.position["rcvts_pos"] = self.stromer.position.pop("rcvts")
+        # Skip merging (and notifying entities) when the API returned identical payloads
+        fingerprint = self._payload_fingerprint()
+        if self.data is not None and fingerprint == self._fingerprint:
+            self.skipped_refreshes += 1
+            LOGGER.debug("Stromer data unchanged, skipped %s refreshes", self.skipped_refreshes)
+            self._adapt_update_interval(self.data.bikedata)
+            # A ride may still end by lack of motion, notify the ride entities when it does
+            if self._track_ride(self.data.bikedata):
+                self.async_update_listeners()
+            return self.data  # type: ignore[no-any-return]
 
-            bike_data = self.stromer.bike
-            bike_data.update({"bike_model": self.stromer.bike_model, "bike_name": self.stromer.bike_name})
-            bike_data.update(self.stromer.status)
-            bike_data.update(self.stromer.position)
+        try:
+            data = self._build_data()
+        except (KeyError, TypeError, ValueError) as ex:
+            raise UpdateFailed(f"Invalid data returned from API: {ex}") from ex
+        self._fingerprint = fingerprint
 
-            data = [bike_data, self.stromer.bike_id, self.stromer.bike_name]
-            LOGGER.debug("Stromer data %s updated", data)
+        state = data.bikedata
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            # Only name the changed fields, the (redacted) payloads are logged by the payload logger
+            previous = self.data.bikedata if self.data is not None else None
+            changed = sorted(name for name in FIELDS if getattr(previous, name, None) != getattr(state, name))
+            LOGGER.debug("Stromer data updated: %s", ", ".join(changed))
+        self._adapt_update_interval(state)
+        self._track_ride(state)
+        self.forecast.update(state)
+        if self.snapshot is not None:
+            self.snapshot.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
+        if self.history is not None:
+            self.history.async_append(state)
+        if self.statistics is not None:
+            self.statistics.async_add(state)
+        return data
 
-        except ApiError as ex:
-            raise UpdateFailed(f"Error communicating with API: {ex}") from ex
-        except NextLocationError as ex:
-            raise UpdateFailed("Error while getting authentication location %s", ex) from ex
-        except Exception as ex:
-            raise ConfigEntryAuthFailed from ex
-        return StromerData(*data)  # type: ignore [arg-type]
+
+def _resolve(
+    futures: list[asyncio.Future[bool]], result: bool | None = None, exception: Exception | None = None
+) -> None:
+    """Set the result (or exception) of the command futures not resolved yet."""
+    for future in futures:
+        if future.done():
+            continue
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(bool(result))
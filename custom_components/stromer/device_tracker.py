@@ -45,9 +45,9 @@ class StromerTracker(StromerEntity, TrackerEntity):  # type: ignore[misc]
     @property
     def latitude(self) -> float | None:
         """Return latitude value of the device."""
-        return float(self._coordinator.data.bikedata.get("latitude"))
+        return self._coordinator.data.bikedata.latitude
 
     @property
     def longitude(self) -> float | None:
         """Return longitude value of the device."""
-        return float(self._coordinator.data.bikedata.get("longitude"))
+        return self._coordinator.data.bikedata.longitude
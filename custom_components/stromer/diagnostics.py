@@ -16,7 +16,9 @@ async def async_get_config_entry_diagnostics(
     """Return diagnostics for a config entry."""
     coordinator: StromerDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
     return {
-        "bikedata": coordinator.data.bikedata,
+        "bikedata": coordinator.data.bikedata.as_dict(),
         "bike_id": coordinator.data.bike_id,
         "bike_name": coordinator.data.bike_name,
+        "skipped_refreshes": coordinator.skipped_refreshes,
+        "api_metrics": coordinator.stromer.metrics.as_dict(),
     }
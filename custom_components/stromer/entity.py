@@ -1,16 +1,48 @@
 """Generic Stromer Entity Class."""
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable
 from typing import Any
 
-from homeassistant.const import ATTR_NAME, ATTR_VIA_DEVICE
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.entity import DeviceInfo, Entity, EntityDescription
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, LOGGER
 from .coordinator import StromerData, StromerDataUpdateCoordinator
 
 
+@callback  # type: ignore[misc]
+def async_add_stromer_entities(
+    coordinator: StromerDataUpdateCoordinator,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    descriptions: Iterable[EntityDescription],
+    entity_factory: Callable[[EntityDescription], Entity],
+) -> None:
+    """Add entities for the bike data keys present now and whenever new keys appear."""
+    index = {description.key: description for description in descriptions}
+    available = frozenset(index)
+    added: set[str] = set()
+
+    @callback  # type: ignore[misc]
+    def _async_add_new_entities() -> None:
+        """Add entities for keys not seen before."""
+        if coordinator.data is None:
+            return
+        new_keys = (coordinator.data.bikedata.keys & available) - added
+        if not new_keys:
+            return
+        added.update(new_keys)
+        LOGGER.debug("Add entities for %s", sorted(new_keys))
+        async_add_entities([entity_factory(index[key]) for key in sorted(new_keys)], update_before_add=False)
+
+    _async_add_new_entities()
+    config_entry.async_on_unload(coordinator.async_add_listener(_async_add_new_entities))
+
+
 class StromerEntity(CoordinatorEntity[StromerData]):  # type:ignore [misc]
     """Represent a Stromer Entity."""
 
@@ -23,26 +55,8 @@ class StromerEntity(CoordinatorEntity[StromerData]):  # type:ignore [misc]
         """Initialise the gateway."""
         super().__init__(coordinator)
 
-        configuration_url: str | None = None
-
-        data = coordinator.data.bikedata
-
-        self._attr_device_info = DeviceInfo(
-            configuration_url=configuration_url,
-            identifiers={(DOMAIN, str(coordinator.data.bike_id))},
-            manufacturer="Stromer",
-            model=data.get("bike_model"),
-            name=data.get("bike_name"),
-            sw_version=data.get("suiversion"),
-            hw_version=data.get("tntversion"),
-        )
-
-        self._attr_device_info.update(
-            {
-                ATTR_NAME: data.get("bike_name"),
-                ATTR_VIA_DEVICE: None,
-            }
-        )
+        # Device details are registered (and updated on change) when setting up the entry
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, str(coordinator.data.bike_id))})
 
     @property
     def available(self) -> bool:
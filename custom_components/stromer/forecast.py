@@ -0,0 +1,133 @@
+"""Remaining range and time-to-empty forecast for Stromer bikes."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .coordinator import BikeState
+
+# Half-life of the observations in each regression, in the unit of its variable
+DISTANCE_HALF_LIFE = 100  # km
+ENERGY_HALF_LIFE = 2000  # Wh
+TIME_HALF_LIFE = 4 * 3600  # seconds of riding
+
+# Observed (decayed) amount needed before a regression is used
+DISTANCE_MIN_OBSERVED = 2  # km
+ENERGY_MIN_OBSERVED = 50  # Wh
+TIME_MIN_OBSERVED = 600  # seconds of riding
+
+
+class EWRegression:
+    """Exponentially weighted regression of the battery charge against another variable.
+
+    The slope is fitted through the origin on the increments between refreshes,
+    so charging (which resets the relation) only skips a step. Only two decayed
+    sums are kept, older observations fading out with the given half-life.
+    """
+
+    def __init__(self, half_life: float, min_observed: float) -> None:
+        """Initialize regression."""
+        self.half_life = half_life
+        self.min_observed = min_observed
+        self.sxx = 0.0
+        self.sxy = 0.0
+        self.observed = 0.0
+
+    def update(self, dx: float, dy: float) -> None:
+        """Add the increment of the variable (dx) and the charge (dy)."""
+        decay = 0.5 ** (dx / self.half_life)
+        self.sxx = decay * self.sxx + dx * dx
+        self.sxy = decay * self.sxy + dx * dy
+        self.observed = decay * self.observed + dx
+
+    @property
+    def slope(self) -> float | None:
+        """Return the fitted change of the charge per unit, once enough was observed."""
+        if self.observed < self.min_observed or self.sxx <= 0:
+            return None
+        return self.sxy / self.sxx
+
+    def as_dict(self) -> dict[str, float]:
+        """Return the regression state for storage."""
+        return {"sxx": self.sxx, "sxy": self.sxy, "observed": self.observed}
+
+    def restore(self, data: dict[str, float]) -> None:
+        """Restore a stored regression state."""
+        self.sxx = data["sxx"]
+        self.sxy = data["sxy"]
+        self.observed = data["observed"]
+
+
+class RangeForecast:
+    """Forecast of the remaining range and riding time of a single bike.
+
+    Fitted incrementally on each refresh from the battery charge against the
+    total distance, energy consumption and riding time of the bike.
+    """
+
+    def __init__(self) -> None:
+        """Initialize range forecast."""
+        self.distance = EWRegression(DISTANCE_HALF_LIFE, DISTANCE_MIN_OBSERVED)
+        self.energy = EWRegression(ENERGY_HALF_LIFE, ENERGY_MIN_OBSERVED)
+        self.time = EWRegression(TIME_HALF_LIFE, TIME_MIN_OBSERVED)
+        self.remaining_range: float | None = None
+        self.time_to_empty: float | None = None
+        self._last: tuple[float, float | None, float | None, float | None] | None = None
+
+    def update(self, state: BikeState) -> None:
+        """Fold the state of a refresh into the regressions and update the forecast."""
+        if state.battery_SOC is None:
+            return
+        current = (
+            float(state.battery_SOC),
+            _float(state.total_distance),
+            _float(state.total_energy_consumption),
+            _float(state.total_time),
+        )
+        last, self._last = self._last, current
+        # Only learn from discharging steps, charging starts a new relation
+        if last is not None and current[0] <= last[0]:
+            dy = current[0] - last[0]
+            for regression, now, before in (
+                (self.distance, current[1], last[1]),
+                (self.energy, current[2], last[2]),
+                (self.time, current[3], last[3]),
+            ):
+                if now is not None and before is not None and now > before:
+                    regression.update(now - before, dy)
+
+        self.remaining_range = self._remaining(self.distance.slope, state)
+        if self.remaining_range is None and (energy_slope := self.energy.slope) and state.average_energy_consumption:
+            # Remaining energy over the average consumption (Wh/km) reported by the bike
+            remaining_energy = self._remaining(energy_slope, state)
+            if remaining_energy is not None:
+                self.remaining_range = round(remaining_energy / float(state.average_energy_consumption), 1)
+        self.time_to_empty = self._remaining(self.time.slope, state)
+
+    @staticmethod
+    def _remaining(slope: float | None, state: BikeState) -> float | None:
+        """Return the amount of a variable left until the charge is depleted."""
+        if slope is None or slope >= 0 or state.battery_SOC is None:
+            return None
+        return round(float(state.battery_SOC) / -slope, 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the forecast state for storage."""
+        return {
+            "distance": self.distance.as_dict(),
+            "energy": self.energy.as_dict(),
+            "time": self.time.as_dict(),
+            "last": self._last,
+        }
+
+    def restore(self, data: dict[str, Any]) -> None:
+        """Restore a stored forecast state."""
+        self.distance.restore(data["distance"])
+        self.energy.restore(data["energy"])
+        self.time.restore(data["time"])
+        self._last = tuple(data["last"]) if data.get("last") else None  # type: ignore[assignment]
+
+
+def _float(value: Any) -> float | None:
+    """Return a value as float, if available."""
+    return None if value is None else float(value)
@@ -0,0 +1,184 @@
+"""Compact on-disk telemetry history for Stromer bikes."""
+from __future__ import annotations
+
+from array import array
+import asyncio
+from datetime import UTC, date, datetime, timedelta
+import math
+from pathlib import Path
+import shutil
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from .const import DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from .coordinator import BikeState
+
+# Column name, array typecode and BikeState field of each stored value
+COLUMNS: tuple[tuple[str, str, str], ...] = (
+    ("timestamp", "q", "timets"),
+    ("latitude", "d", "latitude"),
+    ("longitude", "d", "longitude"),
+    ("speed", "f", "speed"),
+    ("battery_soc", "f", "battery_SOC"),
+    ("battery_temp", "f", "battery_temp"),
+    ("motor_temp", "f", "motor_temp"),
+    ("total_distance", "d", "total_distance"),
+    ("total_energy_consumption", "d", "total_energy_consumption"),
+    ("total_time", "d", "total_time"),
+    ("power_on_cycles", "d", "power_on_cycles"),
+)
+
+# Number of buffered rows triggering a write
+BATCH_SIZE = 50
+
+
+class StromerHistory:
+    """Append-only, column-oriented history store of a single bike.
+
+    Rows are buffered in memory and appended in batches to one file per column,
+    split into daily segments so retention is a matter of removing directories.
+    """
+
+    def __init__(self, hass: HomeAssistant, bike_id: str, retention: int) -> None:
+        """Initialize history store."""
+        self.hass = hass
+        self.retention = retention
+        self.path = Path(hass.config.path(STORAGE_DIR, DOMAIN, "history", str(bike_id)))
+        self._buffer: dict[str, array[Any]] = {name: array(typecode) for name, typecode, _ in COLUMNS}
+        self._last_timestamp: int | None = None
+        self._purged: date | None = None
+        # Flushes append to the same column files, so only one may run at a time
+        self._lock = asyncio.Lock()
+
+    @callback  # type: ignore[misc]
+    def async_append(self, state: BikeState) -> None:
+        """Buffer a row from the bike state of a coordinator refresh."""
+        measured = state.timets or state.rcvts
+        if measured is None or int(measured.timestamp()) == self._last_timestamp:
+            return
+        self._last_timestamp = int(measured.timestamp())
+
+        for name, _typecode, key in COLUMNS:
+            if name == "timestamp":
+                self._buffer[name].append(self._last_timestamp)
+                continue
+            value = getattr(state, key)
+            self._buffer[name].append(math.nan if value is None else float(value))
+
+        if len(self._buffer["timestamp"]) >= BATCH_SIZE:
+            self.hass.async_create_background_task(self.async_flush(), f"{DOMAIN} history flush")
+
+    async def async_flush(self) -> None:
+        """Write buffered rows to disk and apply retention."""
+        async with self._lock:
+            if not self._buffer["timestamp"]:
+                return
+            buffer = self._buffer
+            self._buffer = {name: array(typecode) for name, typecode, _ in COLUMNS}
+            await self.hass.async_add_executor_job(self._write, buffer)
+
+    async def async_remove(self) -> None:
+        """Remove the stored history of the bike."""
+        async with self._lock:
+            self._buffer = {name: array(typecode) for name, typecode, _ in COLUMNS}
+            await self.hass.async_add_executor_job(shutil.rmtree, self.path, True)
+
+    def _write(self, buffer: dict[str, array]) -> None:
+        """Append rows to the daily segments (executor)."""
+        timestamps = buffer["timestamp"]
+        start = 0
+        while start < len(timestamps):
+            day = _day(timestamps[start])
+            end = start
+            while end < len(timestamps) and _day(timestamps[end]) == day:
+                end += 1
+            segment = self.path / day.isoformat()
+            segment.mkdir(parents=True, exist_ok=True)
+            timestamps_file = segment / "timestamp.bin"
+            existing = timestamps_file.stat().st_size // timestamps.itemsize if timestamps_file.exists() else 0
+            for name, column in buffer.items():
+                file_path = segment / f"{name}.bin"
+                # Keep rows aligned when a column was added to a segment written before
+                padding = existing if existing and not file_path.exists() else 0
+                with file_path.open("ab") as file:
+                    array(column.typecode, [math.nan] * padding).tofile(file)
+                    column[start:end].tofile(file)
+            start = end
+        LOGGER.debug("Stromer history stored %s rows in %s", len(timestamps), self.path)
+
+        today = datetime.now(tz=UTC).date()
+        if self.retention and self._purged != today:
+            self._purged = today
+            self._purge(today - timedelta(days=self.retention))
+
+    def _purge(self, oldest: date) -> None:
+        """Remove daily segments older than the retention (executor)."""
+        for segment in self.path.iterdir():
+            try:
+                expired = date.fromisoformat(segment.name) < oldest
+            except ValueError:
+                continue
+            if expired:
+                LOGGER.debug("Stromer history removing %s", segment)
+                shutil.rmtree(segment, ignore_errors=True)
+
+    async def async_read(self, start: datetime | None = None, end: datetime | None = None) -> dict[str, array]:
+        """Return the stored (and buffered) rows between start and end as columns."""
+        # Wait for a running flush, so its rows are neither missed nor half read
+        async with self._lock:
+            columns: dict[str, array[Any]] = await self.hass.async_add_executor_job(self._read, start, end)
+        for name, column in self._buffer.items():
+            columns[name].extend(column)
+        return columns
+
+    def _read(self, start: datetime | None, end: datetime | None) -> dict[str, array]:
+        """Read the daily segments between start and end (executor)."""
+        columns = {name: array(typecode) for name, typecode, _ in COLUMNS}
+        if not self.path.exists():
+            return columns
+        first = start.astimezone(UTC).date() if start else date.min
+        last = end.astimezone(UTC).date() if end else date.max
+        for segment in sorted(self.path.iterdir()):
+            try:
+                day = date.fromisoformat(segment.name)
+            except ValueError:
+                continue
+            if not first <= day <= last:
+                continue
+            segment_columns: dict[str, array[Any]] = {name: array(typecode) for name, typecode, _ in COLUMNS}
+            missing = []
+            for name, column in segment_columns.items():
+                file = segment / f"{name}.bin"
+                if not file.exists():
+                    missing.append(name)
+                    continue
+                data = file.read_bytes()
+                column.frombytes(data[: len(data) - len(data) % column.itemsize])
+            if "timestamp" in missing:
+                continue
+            # Ignore rows of a partially written batch
+            rows = min(len(column) for name, column in segment_columns.items() if name not in missing)
+            for name, column in segment_columns.items():
+                if name in missing:
+                    # Column added after this segment was written
+                    column.extend([math.nan] * rows)
+                columns[name].extend(column[:rows])
+
+        if start or end:
+            low = int(start.timestamp()) if start else -(2**63)
+            high = int(end.timestamp()) if end else 2**63 - 1
+            keep = [idx for idx, timestamp in enumerate(columns["timestamp"]) if low <= timestamp <= high]
+            if len(keep) != len(columns["timestamp"]):
+                columns = {
+                    name: array(column.typecode, (column[idx] for idx in keep)) for name, column in columns.items()
+                }
+        return columns
+
+
+def _day(timestamp: int) -> date:
+    """Return the (UTC) day of a timestamp."""
+    return datetime.fromtimestamp(timestamp, tz=UTC).date()
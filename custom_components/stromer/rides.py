@@ -0,0 +1,160 @@
+"""Incremental ride detection and derived metrics for Stromer bikes."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import math
+from typing import TYPE_CHECKING, Any
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import BikeState
+
+EVENT_RIDE_STARTED = f"{DOMAIN}_ride_started"
+EVENT_RIDE_ENDED = f"{DOMAIN}_ride_ended"
+
+EARTH_RADIUS = 6371.0088  # km
+
+# A bike is riding when unlocked and either going this fast (km/h) or moving this far (km)
+RIDE_MIN_SPEED = 2
+RIDE_MIN_MOVE = 0.05
+# A ride ends when the bike is locked or did not move for this long
+RIDE_STOP_AFTER = timedelta(minutes=5)
+
+# Minimum distance (km) between energy samples, as the totals are reported coarsely
+EFFICIENCY_MIN_DISTANCE = 0.5
+# Weight of the newest sample in the smoothed battery drain rate
+SOC_DRAIN_SMOOTHING = 0.3
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return the great-circle distance between two coordinates in km."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS * math.asin(min(1.0, math.sqrt(a)))
+
+
+class RideTracker:
+    """Online ride detection and derived metrics of a single bike.
+
+    Each refresh is folded into a small running state, so the work per refresh
+    is constant and nothing is recomputed from history.
+    """
+
+    def __init__(self) -> None:
+        """Initialize ride tracker."""
+        self.riding = False
+        self.ride_started: datetime | None = None
+        self.ride_ended: datetime | None = None
+        self.ride_distance = 0.0
+        self.energy_efficiency: float | None = None
+        self.soc_drain_rate: float | None = None
+
+        self._fix: tuple[float, float] | None = None
+        self._last_motion: datetime | None = None
+        self._ride_totals: tuple[float | None, float | None, float | None] = (None, None, None)
+        self._efficiency_base: tuple[float, float] | None = None
+        self._soc_base: tuple[datetime, float] | None = None
+
+    @property
+    def ride_duration(self) -> float | None:
+        """Return the duration of the current (or last) ride in seconds."""
+        if self.ride_started is None:
+            return None
+        end = self._last_motion if self.riding else self.ride_ended
+        if end is None:
+            return 0.0
+        return max(0.0, (end - self.ride_started).total_seconds())
+
+    def update(self, state: BikeState, now: datetime) -> list[tuple[str, dict[str, Any]]]:
+        """Fold the state of a refresh into the running state, returning the ride events."""
+        moved = 0.0
+        if state.latitude is not None and state.longitude is not None:
+            fix = (state.latitude, state.longitude)
+            if self._fix is not None and fix != self._fix:
+                moved = haversine(*self._fix, *fix)
+            self._fix = fix
+
+        speed = max(state.bike_speed or 0, state.speed or 0)
+        in_motion = not state.lock_flag and (speed >= RIDE_MIN_SPEED or moved >= RIDE_MIN_MOVE)
+        if in_motion:
+            self._last_motion = now
+
+        self._update_efficiency(state)
+        self._update_soc_drain(state, now)
+
+        events: list[tuple[str, dict[str, Any]]] = []
+        if not self.riding and in_motion:
+            self.riding = True
+            self.ride_started = now
+            self.ride_ended = None
+            self.ride_distance = moved
+            self._ride_totals = (state.total_distance, state.total_energy_consumption, state.battery_SOC)
+            events.append((EVENT_RIDE_STARTED, {"started": now.isoformat()}))
+        elif self.riding:
+            self.ride_distance += moved
+            idle = self._last_motion is None or now - self._last_motion >= RIDE_STOP_AFTER
+            if state.lock_flag or idle:
+                self.riding = False
+                self.ride_ended = self._last_motion or now
+                events.append((EVENT_RIDE_ENDED, self._ride_summary(state)))
+        return events
+
+    def _update_efficiency(self, state: BikeState) -> None:
+        """Update the energy efficiency (Wh/km) from the distance and energy totals."""
+        if state.total_distance is None or state.total_energy_consumption is None:
+            return
+        totals = (float(state.total_distance), float(state.total_energy_consumption))
+        base = self._efficiency_base
+        # Start over when the totals were reset or went backwards
+        if base is None or totals[0] < base[0] or totals[1] < base[1]:
+            self._efficiency_base = totals
+            return
+        if (distance := totals[0] - base[0]) >= EFFICIENCY_MIN_DISTANCE:
+            self.energy_efficiency = round((totals[1] - base[1]) / distance, 1)
+            self._efficiency_base = totals
+
+    def _update_soc_drain(self, state: BikeState, now: datetime) -> None:
+        """Update the smoothed battery drain rate (%/h) on each change of the charge."""
+        if state.battery_SOC is None:
+            return
+        measured = state.rcvts or now
+        soc = float(state.battery_SOC)
+        base = self._soc_base
+        if base is None or soc > base[1]:
+            # Charging does not count as drain
+            self._soc_base = (measured, soc)
+            return
+        hours = (measured - base[0]).total_seconds() / 3600
+        if soc == base[1] or hours <= 0:
+            return
+        sample = (base[1] - soc) / hours
+        if self.soc_drain_rate is None:
+            self.soc_drain_rate = round(sample, 2)
+        else:
+            self.soc_drain_rate = round(
+                SOC_DRAIN_SMOOTHING * sample + (1 - SOC_DRAIN_SMOOTHING) * self.soc_drain_rate, 2
+            )
+        self._soc_base = (measured, soc)
+
+    def _ride_summary(self, state: BikeState) -> dict[str, Any]:
+        """Return the event data of a finished ride."""
+        distance, energy, soc = self._ride_totals
+        odometer = None if distance is None or state.total_distance is None else round(state.total_distance - distance, 3)
+        used = (
+            None
+            if energy is None or state.total_energy_consumption is None
+            else state.total_energy_consumption - energy
+        )
+        return {
+            "started": self.ride_started.isoformat() if self.ride_started else None,
+            "ended": self.ride_ended.isoformat() if self.ride_ended else None,
+            "duration": self.ride_duration,
+            "distance": round(self.ride_distance, 3),
+            "odometer_distance": odometer,
+            "energy": used,
+            "energy_efficiency": round(used / odometer, 1) if used is not None and odometer else None,
+            "soc_used": None if soc is None or state.battery_SOC is None else soc - state.battery_SOC,
+        }
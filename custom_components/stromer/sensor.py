@@ -1,7 +1,8 @@
 """Stromer Sensor component for Home Assistant."""
 from __future__ import annotations
 
-from datetime import UTC, datetime
+from collections.abc import Callable
+from dataclasses import dataclass
 from typing import Any
 
 from homeassistant.components.sensor import (
@@ -14,19 +15,36 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     PERCENTAGE,
     UnitOfEnergy,
+    UnitOfInformation,
     UnitOfLength,
     UnitOfPressure,
     UnitOfSpeed,
     UnitOfTemperature,
     UnitOfTime,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, LOGGER
+from .const import DOMAIN
 from .coordinator import StromerDataUpdateCoordinator
-from .entity import StromerEntity
+from .entity import StromerEntity, async_add_stromer_entities
+from .stromer import StromerMetrics
+
+
+@dataclass
+class StromerMetricSensorEntityDescription(SensorEntityDescription):  # type: ignore[misc]
+    """Describes a Stromer API metric sensor entity."""
+
+    value_fn: Callable[[StromerMetrics], Any] = lambda metrics: None
+
+
+@dataclass
+class StromerDerivedSensorEntityDescription(SensorEntityDescription):  # type: ignore[misc]
+    """Describes a Stromer sensor entity derived from consecutive refreshes."""
+
+    value_fn: Callable[[StromerDataUpdateCoordinator], Any] = lambda coordinator: None
+
 
 SENSORS: tuple[SensorEntityDescription, ...] = (
     SensorEntityDescription(
@@ -172,18 +190,126 @@ SENSORS: tuple[SensorEntityDescription, ...] = (
 )
 
 
+DERIVED_SENSORS: tuple[StromerDerivedSensorEntityDescription, ...] = (
+    StromerDerivedSensorEntityDescription(
+        key="ride_started",
+        translation_key="ride_started",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda coordinator: coordinator.rides.ride_started,
+    ),
+    StromerDerivedSensorEntityDescription(
+        key="ride_distance",
+        translation_key="ride_distance",
+        native_unit_of_measurement=UnitOfLength.KILOMETERS,
+        device_class=SensorDeviceClass.DISTANCE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda coordinator: (
+            round(coordinator.rides.ride_distance, 3) if coordinator.rides.ride_started else None
+        ),
+    ),
+    StromerDerivedSensorEntityDescription(
+        key="ride_duration",
+        translation_key="ride_duration",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.rides.ride_duration,
+    ),
+    StromerDerivedSensorEntityDescription(
+        key="energy_efficiency",
+        translation_key="energy_efficiency",
+        native_unit_of_measurement=f"{UnitOfEnergy.WATT_HOUR}/{UnitOfLength.KILOMETERS}",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.rides.energy_efficiency,
+    ),
+    StromerDerivedSensorEntityDescription(
+        key="battery_drain_rate",
+        translation_key="battery_drain_rate",
+        native_unit_of_measurement=f"{PERCENTAGE}/h",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.rides.soc_drain_rate,
+    ),
+    StromerDerivedSensorEntityDescription(
+        key="estimated_range",
+        translation_key="estimated_range",
+        native_unit_of_measurement=UnitOfLength.KILOMETERS,
+        device_class=SensorDeviceClass.DISTANCE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.forecast.remaining_range,
+    ),
+    StromerDerivedSensorEntityDescription(
+        key="time_to_empty",
+        translation_key="time_to_empty",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_unit_of_measurement=UnitOfTime.HOURS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.forecast.time_to_empty,
+    ),
+)
+
+
+METRIC_SENSORS: tuple[StromerMetricSensorEntityDescription, ...] = (
+    StromerMetricSensorEntityDescription(
+        key="api_latency",
+        translation_key="api_latency",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda metrics: None if metrics.latency_recent is None else round(metrics.latency_recent * 1000),
+    ),
+    StromerMetricSensorEntityDescription(
+        key="api_retries",
+        translation_key="api_retries",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda metrics: metrics.retries,
+    ),
+    StromerMetricSensorEntityDescription(
+        key="api_reconnects",
+        translation_key="api_reconnects",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda metrics: metrics.reconnects,
+    ),
+    StromerMetricSensorEntityDescription(
+        key="api_bytes_received",
+        translation_key="api_bytes_received",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda metrics: metrics.bytes_received,
+    ),
+    StromerMetricSensorEntityDescription(
+        key="api_last_error",
+        translation_key="api_last_error",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda metrics: metrics.last_error,
+    ),
+)
+
+
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
     """Set up the Stromer sensors from a config entry."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
 
-    entities = []
-    for idx, data in enumerate(coordinator.data.bikedata.items()):
-        for description in SENSORS:
-            if data[0] == description.key:
-                entities.append(StromerSensor(coordinator, idx, data, description))
-                LOGGER.debug("Add %s %s sensor", data, description.translation_key)
+    async_add_stromer_entities(
+        coordinator,
+        config_entry,
+        async_add_entities,
+        SENSORS,
+        lambda description: StromerSensor(coordinator, description),
+    )
 
-    async_add_entities(entities, update_before_add=False)
+    async_add_entities(
+        [StromerDerivedSensor(coordinator, description) for description in DERIVED_SENSORS]
+        + [StromerMetricSensor(coordinator, description) for description in METRIC_SENSORS],
+        update_before_add=False,
+    )
 
 
 class StromerSensor(StromerEntity, SensorEntity):  # type: ignore[misc]
@@ -196,13 +322,38 @@ class StromerSensor(StromerEntity, SensorEntity):  # type: ignore[misc]
     def __init__(
         self,
         coordinator: StromerDataUpdateCoordinator,
-        idx: int,
-        data: dict,
         description: SensorEntityDescription,
     ):
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self._ent = data[0]
+        self._ent = description.key
+        self._coordinator = coordinator
+
+        device_id = coordinator.data.bike_id
+
+        self.entity_description = description
+        self._attr_unique_id = f"{device_id}-{description.key}"
+
+    @property
+    def native_value(self) -> Any:
+        """Return the state of the sensor."""
+        return getattr(self._coordinator.data.bikedata, self._ent)
+
+
+class StromerDerivedSensor(StromerEntity, SensorEntity):  # type: ignore[misc]
+    """Representation of a Sensor derived from consecutive refreshes."""
+
+    _attr_has_entity_name = True
+
+    entity_description: StromerDerivedSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: StromerDataUpdateCoordinator,
+        description: StromerDerivedSensorEntityDescription,
+    ):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
         self._coordinator = coordinator
 
         device_id = coordinator.data.bike_id
@@ -213,13 +364,53 @@ class StromerSensor(StromerEntity, SensorEntity):  # type: ignore[misc]
     @property
     def native_value(self) -> Any:
         """Return the state of the sensor."""
-        if self.entity_description.device_class == SensorDeviceClass.TIMESTAMP:
-            timestamp = self._coordinator.data.bikedata.get(self._ent)
-            if timestamp is None:
-                return None
-            return datetime.fromtimestamp(
-                int(timestamp),
-                tz=UTC,
-            )
-
-        return self._coordinator.data.bikedata.get(self._ent)
+        return self.entity_description.value_fn(self._coordinator)
+
+
+class StromerMetricSensor(StromerEntity, SensorEntity):  # type: ignore[misc]
+    """Representation of an API metric Sensor.
+
+    The metrics belong to the account, so each bike of an account shows the
+    same values. The sensor is updated by the client whenever its value changes.
+    """
+
+    _attr_has_entity_name = True
+
+    entity_description: StromerMetricSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: StromerDataUpdateCoordinator,
+        description: StromerMetricSensorEntityDescription,
+    ):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._coordinator = coordinator
+
+        device_id = coordinator.data.bike_id
+
+        self.entity_description = description
+        self._attr_unique_id = f"{device_id}-{description.key}"
+        self._written: Any = None
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available, also while the API fails."""
+        return True
+
+    @property
+    def native_value(self) -> Any:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self._coordinator.stromer.metrics)
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to metric changes."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._coordinator.stromer.metrics.add_listener(self._handle_metrics_update))
+
+    @callback  # type: ignore[misc]
+    def _handle_metrics_update(self) -> None:
+        """Write the state when the value of the sensor changed."""
+        if (value := self.native_value) != self._written:
+            self._written = value
+            self.async_write_ha_state()
@@ -0,0 +1,163 @@
+"""Hourly long-term statistics of Stromer bike totals."""
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+import math
+from typing import TYPE_CHECKING
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import UnitOfEnergy, UnitOfLength, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, LOGGER
+
+try:
+    from homeassistant.components.recorder.models import StatisticMeanType
+except ImportError:  # pragma: no cover
+    StatisticMeanType = None
+
+if TYPE_CHECKING:
+    from .coordinator import BikeState
+    from .history import StromerHistory
+
+# BikeState field (and history column), name and unit of each statistic
+STATISTICS: tuple[tuple[str, str, str | None], ...] = (
+    ("total_distance", "Total distance", UnitOfLength.KILOMETERS),
+    ("total_energy_consumption", "Total energy consumption", UnitOfEnergy.WATT_HOUR),
+    ("total_time", "Total time", UnitOfTime.SECONDS),
+    ("power_on_cycles", "Power on cycles", None),
+)
+
+
+class StromerStatistics:
+    """Import the totals of a single bike as hourly external statistics.
+
+    The last value within each hour is kept in memory and all completed hours
+    are handed to the recorder in one batch, instead of recording every state.
+    The totals are lifetime counters, so the imported sum only accumulates
+    their increase since the first import and starts at 0.
+    """
+
+    def __init__(self, hass: HomeAssistant, bike_id: str, bike_name: str | None) -> None:
+        """Initialize statistics importer."""
+        self.hass = hass
+        self.metadata = {
+            key: _metadata(f"{bike_name or bike_id} {name}", f"{DOMAIN}:{str(bike_id).lower()}_{key}", unit)
+            for key, name, unit in STATISTICS
+        }
+        # Last value of each statistic per hour not imported yet
+        self._pending: dict[datetime, dict[str, float]] = {}
+        self._imported: datetime | None = None
+        # Start, state and sum of the last imported hour of each statistic
+        self._last: dict[str, tuple[datetime, float, float]] | None = None
+        self._lock = asyncio.Lock()
+
+    @callback  # type: ignore[misc]
+    def async_add(self, state: BikeState) -> None:
+        """Add the totals of a refresh, importing the hours completed before it."""
+        measured = state.timets or state.rcvts
+        if measured is None:
+            return
+        hour = _hour(measured)
+        if self._imported is not None and hour <= self._imported:
+            return
+        values = {key: float(value) for key, _, _ in STATISTICS if (value := getattr(state, key)) is not None}
+        self._pending.setdefault(hour, {}).update(values)
+
+        completed = [pending for pending in self._pending if pending < hour]
+        if completed:
+            hours = {pending: self._pending.pop(pending) for pending in sorted(completed)}
+            self._imported = max(completed)
+            self.hass.async_create_background_task(self._async_import(hours), f"{DOMAIN} statistics import")
+
+    async def _async_import(self, hours: dict[datetime, dict[str, float]]) -> None:
+        """Hand a batch of hourly values to the recorder."""
+        async with self._lock:
+            last = await self._async_last()
+            for key, metadata in self.metadata.items():
+                statistics = []
+                previous = last.get(key)
+                for hour, values in sorted(hours.items()):
+                    if key not in values or (previous is not None and hour <= previous[0]):
+                        continue
+                    value = values[key]
+                    total = 0.0
+                    if previous is not None:
+                        # A total going backwards (reset or glitch) adds nothing
+                        total = previous[2] + max(0.0, value - previous[1])
+                    statistics.append(StatisticData(start=hour, state=value, sum=total))
+                    previous = (hour, value, total)
+                if statistics:
+                    async_add_external_statistics(self.hass, metadata, statistics)
+                    last[key] = previous  # type: ignore[assignment]
+        LOGGER.debug("Stromer statistics imported %s hours up to %s", len(hours), max(hours))
+
+    async def _async_last(self) -> dict[str, tuple[datetime, float, float]]:
+        """Return the last imported hour of each statistic, loading it from the recorder once."""
+        if self._last is None:
+            self._last = await get_instance(self.hass).async_add_executor_job(self._last_statistics)
+        return self._last
+
+    async def async_backfill(self, history: StromerHistory) -> None:
+        """Import the hours kept in the local history that are not in the statistics yet."""
+        async with self._lock:
+            last = await self._async_last()
+        imported = [start for start, _state, _sum in last.values()]
+        # Statistics missing from the recorder are backfilled from the start of the history
+        since = min(imported) if imported and len(imported) == len(self.metadata) else None
+        columns = await history.async_read(None if since is None else since + timedelta(hours=1))
+
+        hours: dict[datetime, dict[str, float]] = {}
+        for idx, timestamp in enumerate(columns["timestamp"]):
+            values = hours.setdefault(_hour(datetime.fromtimestamp(timestamp, tz=UTC)), {})
+            for key, _, _ in STATISTICS:
+                if not math.isnan(value := columns[key][idx]):
+                    values[key] = value
+
+        # The current hour is still being recorded
+        current = _hour(datetime.now(tz=UTC))
+        hours = {hour: values for hour, values in hours.items() if hour < current and values}
+        if hours:
+            if self._imported is None or max(hours) > self._imported:
+                self._imported = max(hours)
+            await self._async_import(hours)
+        LOGGER.debug("Stromer statistics backfilled %s hours", len(hours))
+
+    def _last_statistics(self) -> dict[str, tuple[datetime, float, float]]:
+        """Return the start, state and sum of the last imported hour (recorder executor)."""
+        last: dict[str, tuple[datetime, float, float]] = {}
+        for key, metadata in self.metadata.items():
+            statistic_id = metadata["statistic_id"]
+            rows = get_last_statistics(self.hass, 1, statistic_id, False, {"state", "sum"}).get(statistic_id)
+            if rows:
+                row = rows[0]
+                last[key] = (datetime.fromtimestamp(row["start"], tz=UTC), row["state"] or 0.0, row["sum"] or 0.0)
+        return last
+
+
+def _metadata(name: str, statistic_id: str, unit: str | None) -> StatisticMetaData:
+    """Return the metadata of a statistic holding only a sum."""
+    metadata = StatisticMetaData(
+        has_sum=True,
+        name=name,
+        source=DOMAIN,
+        statistic_id=statistic_id,
+        unit_of_measurement=unit,
+    )
+    if StatisticMeanType is not None:
+        # Replaces has_mean since Home Assistant 2025.4
+        metadata["mean_type"] = StatisticMeanType.NONE
+    else:
+        metadata["has_mean"] = False
+    return metadata
+
+
+def _hour(moment: datetime) -> datetime:
+    """Return the start of the hour of a moment."""
+    return moment.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
@@ -1,29 +1,320 @@
 """Stromer module for Home Assistant Core."""
 
+from __future__ import annotations
+
 __version__ = "0.2.0"
 
 import asyncio
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass
 import json
 import logging
+import random
 import re
-from typing import Any
+import time
+from typing import Any, TypeVar
 from urllib.parse import urlencode
 
 import aiodns
 import aiohttp
 
+try:
+    import orjson
+
+    json_loads: Callable[[bytes], Any] = orjson.loads
+except ImportError:  # pragma: no cover
+    json_loads = json.loads
+
 LOGGER = logging.getLogger(__name__)
 
+# Renew the access token this many seconds before it expires
+TOKEN_REFRESH_MARGIN = 300
+
+# Seconds the bike inventory of an account is reused before fetching it again. The
+# inventory lives as long as the account, which is dropped once no entry uses it
+BIKE_INVENTORY_TTL = 86400
+
+# Connection pooling of the shared session: concurrent connections to the API host,
+# seconds to keep idle connections open and seconds to cache DNS lookups
+CONNECTION_LIMIT_PER_HOST = 4
+KEEPALIVE_TIMEOUT = 60
+DNS_CACHE_TTL = 600
+
+# Payload fields never written to the (debug) log
+REDACT_KEYS = {
+    "access_token",
+    "altitude",
+    "bikeid",
+    "bikenumber",
+    "frame_number",
+    "latitude",
+    "longitude",
+    "password",
+    "refresh_token",
+    "username",
+}
+REDACTED = "**REDACTED**"
+
+PAYLOAD_LOGGING_MODES = ("full", "diff", "sample")
+
+_T = TypeVar("_T")
+_MISSING = object()
+
+
+def redact_payload(payload: Any) -> Any:
+    """Return a copy of a payload with sensitive fields redacted."""
+    if isinstance(payload, dict):
+        return {key: REDACTED if key in REDACT_KEYS else redact_payload(value) for key, value in payload.items()}
+    if isinstance(payload, list):
+        return [redact_payload(value) for value in payload]
+    return payload
+
+
+class PayloadLogger:
+    """Log API payloads in full, as a diff or sampled, with sensitive fields redacted."""
+
+    def __init__(self, mode: str = "full", sample_rate: int = 10) -> None:
+        """Initialize payload logger."""
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self._count: dict[str, int] = {}
+        self._previous: dict[str, dict] = {}
+
+    def log(self, kind: str, payload: Any) -> None:
+        """Log a payload, only doing any work if debug logging is enabled."""
+        if not LOGGER.isEnabledFor(logging.DEBUG):
+            return
+
+        if self.mode == "sample":
+            count = self._count[kind] = self._count.get(kind, 0) + 1
+            if (count - 1) % self.sample_rate:
+                return
+            LOGGER.debug("Stromer %s (sample %s): %s", kind, count, redact_payload(payload))
+            return
+
+        if self.mode == "diff" and isinstance(payload, dict):
+            previous = self._previous.get(kind)
+            self._previous[kind] = dict(payload)
+            if previous is not None:
+                changed = {key: value for key, value in payload.items() if previous.get(key, _MISSING) != value}
+                LOGGER.debug("Stromer %s changed: %s", kind, redact_payload(changed))
+                return
 
-class Stromer:
-    """Set up Stromer."""
+        LOGGER.debug("Stromer %s: %s", kind, redact_payload(payload))
 
-    def __init__(self, username: str, password: str, client_id: str, client_secret: str, timeout: int = 60) -> None:
-        """Initialize stromer module."""
-        self.bike: dict = {}
-        self.status: dict = {}
-        self.position: dict = {}
 
+@dataclass
+class RetryPolicy:
+    """Capped exponential backoff with full jitter and a total time budget."""
+
+    attempts: int = 10
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    budget: float = 120.0
+
+    def delay(self, attempt: int) -> float:
+        """Return the (jittered) delay before retrying after the given attempt."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))  # nosec B311
+
+
+class CircuitBreaker:
+    """Fail fast while the API is known to be down, probing it once in a while."""
+
+    def __init__(self, threshold: int = 3, reset_timeout: float = 300) -> None:
+        """Initialize circuit breaker."""
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        """Return if the breaker is open (i.e. calls are being refused)."""
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        """Return if a call may be made, letting a single probe through after the timeout."""
+        if self._opened_at is None:
+            return True
+        if self._probing or time.monotonic() - self._opened_at < self.reset_timeout:
+            return False
+        LOGGER.debug("Stromer API circuit half-open, probing")
+        self._probing = True
+        return True
+
+    def release(self) -> None:
+        """Let another probe through when a probe ended without an outcome (e.g. cancelled)."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        if self._opened_at is not None:
+            LOGGER.info("Stromer API available again")
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the breaker when the threshold is reached."""
+        self.failures += 1
+        if self._probing or self.failures >= self.threshold:
+            if self._opened_at is None:
+                LOGGER.warning("Stromer API unavailable, pausing requests for %s seconds", self.reset_timeout)
+            self._opened_at = time.monotonic()
+            self._probing = False
+
+
+# Deadline (monotonic) of the outermost retried call running in the current task
+_RETRY_DEADLINE: ContextVar[float | None] = ContextVar("stromer_retry_deadline", default=None)
+
+# Upper bounds (in seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+
+class StromerMetrics:
+    """Keep per-endpoint latency histograms and retry, reconnect and error counters.
+
+    The metrics are kept per account, so all bikes of an account share them.
+    Listeners are called whenever a metric changes.
+    """
+
+    def __init__(self) -> None:
+        """Initialize metrics."""
+        self.latency: dict[str, list[int]] = {}
+        self.latency_sum: dict[str, float] = {}
+        self.latency_recent: float | None = None
+        self.requests = 0
+        self.retries = 0
+        self.reconnects = 0
+        self.bytes_received = 0
+        self.last_error: str | None = None
+        self._listeners: list[Callable[[], None]] = []
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call a listener on each change of the metrics, returning a callable removing it."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def _notify(self) -> None:
+        """Call the listeners after a change of the metrics."""
+        for listener in list(self._listeners):
+            listener()
+
+    def record_request(self, endpoint: str, elapsed: float, received: int) -> None:
+        """Record the latency and size of a request to an endpoint."""
+        # Use the last path segment (e.g. state, position) so all bikes share the histograms
+        name = endpoint.rstrip("/").rsplit("/", 1)[-1]
+        if (histogram := self.latency.get(name)) is None:
+            histogram = self.latency[name] = [0] * len(LATENCY_BUCKETS)
+        histogram[next(idx for idx, bound in enumerate(LATENCY_BUCKETS) if elapsed <= bound)] += 1
+        self.latency_sum[name] = self.latency_sum.get(name, 0.0) + elapsed
+        # Exponentially weighted moving average, following degradation quickly
+        if self.latency_recent is None:
+            self.latency_recent = elapsed
+        else:
+            self.latency_recent += 0.2 * (elapsed - self.latency_recent)
+        self.requests += 1
+        self.bytes_received += received
+        self._notify()
+
+    def record_error(self, error: BaseException) -> None:
+        """Record the class of the last error."""
+        self.last_error = type(error).__name__
+        self._notify()
+
+    def record_retry(self) -> None:
+        """Record a retried request."""
+        self.retries += 1
+        self._notify()
+
+    def record_reconnect(self) -> None:
+        """Record a renewal of the token or login."""
+        self.reconnects += 1
+        self._notify()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics (e.g. for diagnostics)."""
+        return {
+            "latency": {
+                name: {
+                    "buckets": dict(zip((str(bound) for bound in LATENCY_BUCKETS), histogram, strict=True)),
+                    "count": sum(histogram),
+                    "average": self.latency_sum[name] / sum(histogram),
+                }
+                for name, histogram in self.latency.items()
+            },
+            "latency_recent": self.latency_recent,
+            "requests": self.requests,
+            "retries": self.retries,
+            "reconnects": self.reconnects,
+            "bytes_received": self.bytes_received,
+            "last_error": self.last_error,
+        }
+
+
+@dataclass
+class StromerToken:
+    """Access token with its lifetime and refresh token as issued by the API."""
+
+    access_token: str
+    refresh_token: str | None = None
+    expires_at: float | None = None
+    refresh_at: float | None = None
+
+    @classmethod
+    def from_response(cls, token: dict[str, Any]) -> StromerToken:
+        """Create a token from an OAuth token endpoint response."""
+        if not isinstance(token, dict) or "access_token" not in token:
+            raise ApiError("No access token returned from Stromer API")
+        expires_at = refresh_at = None
+        if expires_in := token.get("expires_in"):
+            expires_at = time.time() + float(expires_in)
+            # Renew ahead of expiry, but never within the first half of a short-lived token
+            refresh_at = expires_at - min(TOKEN_REFRESH_MARGIN, float(expires_in) / 2)
+        return cls(token["access_token"], token.get("refresh_token"), expires_at, refresh_at)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> StromerToken:
+        """Create a token from its stored representation."""
+        return cls(data["access_token"], data.get("refresh_token"), data.get("expires_at"), data.get("refresh_at"))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the token as a dictionary suitable for storage."""
+        return {
+            "access_token": self.access_token,
+            "refresh_token": self.refresh_token,
+            "expires_at": self.expires_at,
+            "refresh_at": self.refresh_at,
+        }
+
+    def needs_refresh(self) -> bool:
+        """Return if the token expires soon and should be renewed."""
+        return self.refresh_at is not None and self.refresh_at <= time.time()
+
+
+async def stromer_decode(res: aiohttp.ClientResponse, envelope: bool = False) -> Any:
+    """Decode a JSON response straight from its body, optionally validating the data envelope."""
+    if res.status >= 500:
+        raise TransientApiError(f"Server error (status {res.status})")
+    if res.content_type != "application/json":
+        raise ApiError(f"Unexpected content type {res.content_type} (status {res.status})")
+    try:
+        ret = json_loads(await res.read())
+    except ValueError as e:
+        raise ApiError(f"Invalid JSON returned (status {res.status})") from e
+
+    if envelope and not (isinstance(ret, dict) and isinstance(ret.get("data"), list)):
+        raise ApiError(f"Unexpected response returned (status {res.status})")
+    return ret
+
+
+class StromerAccount:
+    """Set up a Stromer account shared by all bikes of a user."""
+
+    def __init__(self, username: str, password: str, client_id: str, client_secret: str, timeout: int = 60) -> None:
+        """Initialize stromer account."""
         self._api_version: str = "v4"
         if client_secret:
             self._api_version = "v3"
@@ -37,19 +328,152 @@ class Stromer:
         self._client_id: str = client_id
         self._client_secret: str = client_secret
 
+        self._websession: aiohttp.ClientSession | None = None
+        # Set once disconnected, the session is not recreated afterwards
+        self._closed = False
+        self._connect_lock = asyncio.Lock()
         self._code: str | None = None
-        self._token: str | None = None
+        self._token: StromerToken | None = None
+        # Finished renewal attempts and the error of the last one, shared with waiting callers
+        self._renewals = 0
+        self._renewal_error: Exception | None = None
+        # Rejected login, kept until the credentials change
+        self._auth_error: AuthenticationError | None = None
+        # Called with each newly issued token, i.e. to persist it
+        self.token_callback: Callable[[StromerToken], None] | None = None
+
+        self.retry_policy = RetryPolicy()
+        self.payload_logger = PayloadLogger()
+        self.metrics = StromerMetrics()
+        self.circuit_breaker = CircuitBreaker()
 
         self.full_data: dict = {}
-        self.bike_id: str | None = None
-        self.bike_name: str | None = None
-        self.bike_model: str | None = None
+        self._full_data_fetched: float | None = None
+        self._bikes: dict[str, Stromer] = {}
+
+    def get_bike(self, bike_id: str, bike_name: str | None = None, bike_model: str | None = None) -> Stromer:
+        """Return the (shared) handle for a bike within this account."""
+        if (bike := self._bikes.get(bike_id)) is None:
+            bike = self._bikes[bike_id] = Stromer(self, bike_id)
+        bike.bike_name = bike_name
+        bike.bike_model = bike_model
+        return bike
+
+    def release_bike(self, bike_id: str) -> None:
+        """Drop the handle for a bike."""
+        self._bikes.pop(bike_id, None)
+
+    @property
+    def in_use(self) -> bool:
+        """Return if any bike handle is still using this account."""
+        return bool(self._bikes)
 
     async def stromer_connect(self) -> bool:
-        """Connect to stromer API."""
-        LOGGER.debug("Creating aiohttp session")
-        aio_timeout = aiohttp.ClientTimeout(total=self._timeout)
-        self._websession = aiohttp.ClientSession(timeout=aio_timeout)
+        """Connect to stromer API, logging in only if no valid token is available yet."""
+        await self.stromer_ensure_token()
+        return True
+
+    def uses_credentials(self, username: str, password: str, client_id: str, client_secret: str | None) -> bool:
+        """Return if this account was set up with the given credentials."""
+        return (self._username, self._password, self._client_id, self._client_secret or None) == (
+            username,
+            password,
+            client_id,
+            client_secret or None,
+        )
+
+    @property
+    def token_data(self) -> dict[str, Any] | None:
+        """Return the current token as a dictionary suitable for storage."""
+        if self._token is None:
+            return None
+        return self._token.as_dict()
+
+    def restore_token(self, data: dict[str, Any]) -> None:
+        """Reuse a previously issued (stored) token instead of logging in."""
+        if self._token is None:
+            self._token = StromerToken.from_dict(data)
+
+    def _set_token(self, token: StromerToken) -> None:
+        """Replace the current token by a newly issued one."""
+        self._token = token
+        if self.token_callback is not None:
+            self.token_callback(token)
+
+    def _ensure_websession(self) -> None:
+        """Create the shared session if needed, unless the account was disconnected."""
+        if self._closed:
+            raise ApiError("Stromer API disconnected")
+        if self._websession is None or self._websession.closed:
+            LOGGER.debug("Creating aiohttp session")
+            aio_timeout = aiohttp.ClientTimeout(total=self._timeout)
+            connector = aiohttp.TCPConnector(
+                limit_per_host=CONNECTION_LIMIT_PER_HOST,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=DNS_CACHE_TTL,
+            )
+            self._websession = aiohttp.ClientSession(timeout=aio_timeout, connector=connector)
+
+    @property
+    def auth_rejected(self) -> bool:
+        """Return if the login was rejected with the current credentials."""
+        return self._auth_error is not None
+
+    def update_credentials(self, password: str, client_secret: str | None) -> None:
+        """Use changed credentials for the next login."""
+        self._password = password
+        self._client_secret = client_secret  # type: ignore[assignment]
+        self._api_version = "v3" if client_secret else "v4"
+        self._auth_error = None
+
+    async def stromer_ensure_token(self, stale: str | None = None) -> None:
+        """Ensure a valid token, refreshing or logging in at most once for concurrent callers.
+
+        Callers waiting for a renewal share its outcome, so a failing login is not
+        repeated by each of them. A rejected login is raised again without
+        contacting the API until the credentials are updated.
+        """
+        renewals = self._renewals
+        async with self._connect_lock:
+            self._ensure_websession()
+            if self._auth_error is not None:
+                raise AuthenticationError("Stromer login was rejected before") from self._auth_error
+
+            token = self._token
+            if token is not None and token.access_token != stale and not token.needs_refresh():
+                return
+            if self._renewals != renewals and self._renewal_error is not None:
+                raise TransientApiError("Stromer token renewal failed") from self._renewal_error
+
+            self._renewal_error = None
+            try:
+                await self._stromer_renew_token(token)
+            except AuthenticationError as e:
+                self._auth_error = self._renewal_error = e
+                raise
+            except Exception as e:
+                self._renewal_error = e
+                raise
+            finally:
+                self._renewals += 1
+
+    async def _stromer_renew_token(self, token: StromerToken | None) -> None:
+        """Refresh the token, logging in again when that is not possible."""
+        if token is not None:
+            self.metrics.record_reconnect()
+
+        if token is not None and token.refresh_token:
+            try:
+                await self.stromer_refresh_access_token()
+                return
+            except (ApiError, KeyError, ValueError, aiohttp.ClientError, TimeoutError) as e:
+                LOGGER.warning("Stromer unable to refresh token, logging in again: %s", e)
+
+        await self._stromer_login()
+
+    async def _stromer_login(self) -> None:
+        """Run the full login flow on the shared session."""
+        self._ensure_websession()
 
         # Retrieve authorization token
         await self.stromer_get_code()
@@ -59,78 +483,97 @@ class Stromer:
 
         LOGGER.debug("Stromer connected!")
 
-        return True
-
     async def stromer_disconnect(self) -> None:
-        """Close API web session."""
+        """Close API web session, refusing any further requests."""
         LOGGER.debug("Closing aiohttp session")
-        await self._websession.close()
+        self._closed = True
+        self._token = None
+        if self._websession is not None:
+            await self._websession.close()
+            self._websession = None
+
+    async def stromer_detect(self, max_age: float = BIKE_INVENTORY_TTL) -> dict:
+        """Get full data (to determine bike(s)), reusing data fetched less than max_age seconds ago."""
+        if self._full_data_fetched is not None and time.monotonic() - self._full_data_fetched < max_age:
+            LOGGER.debug("Stromer using cached full data")
+            return self.full_data
 
-    async def stromer_detect(self) -> dict:
-        """Get full data (to determine bike(s))."""
         try:
             self.full_data = await self.stromer_call_api(endpoint="bike/", full=True)
         except Exception as e:
-            log = f"Stromer unable to fetch full data: {e}"
-            LOGGER.error(log)
+            LOGGER.error("Stromer unable to fetch full data: %s", e)
             raise ApiError from e
+        self._full_data_fetched = time.monotonic()
 
-        log = f"Stromer full_data : {self.full_data}"
-        LOGGER.debug(log)
+        self.payload_logger.log("full_data", self.full_data)
         return self.full_data
 
-    async def stromer_update(self) -> None:
-        """Update stromer data through API."""
-        attempts = 0
-        while attempts < 10:
-            if attempts == 5:
-                LOGGER.info("Reconnecting to Stromer API")
-                await self.stromer_connect()
-            attempts += 1
+    def invalidate_inventory(self) -> None:
+        """Fetch the full data again on the next detection."""
+        self._full_data_fetched = None
+
+    async def stromer_retry(
+        self,
+        call: Callable[[int], Awaitable[_T]],
+        description: str,
+        retry_on: tuple[type[BaseException], ...] | None = None,
+    ) -> _T:
+        """Run a call using the retry policy, raising ApiError once retries or the time budget run out.
+
+        Only transport errors and server errors are retried by default, other
+        errors (e.g. a rejected login) are raised right away. A call retried
+        inside another one (e.g. logging in during a refresh) is tried only once
+        within the remaining budget, leaving retries to the outer call.
+        """
+        policy = self.retry_policy
+        retry_on = retry_on or RETRYABLE_ERRORS
+        if (deadline := _RETRY_DEADLINE.get()) is not None:
             try:
-                log = f"Stromer attempt: {attempts}/10"
-                LOGGER.debug(log)
-
-                endpoint = f"bike/{self.bike_id}/state/"
-                self.status = await self.stromer_call_api(endpoint=endpoint)
-                log = f"Stromer status: {self.status}"
-                LOGGER.debug(log)
-
-                endpoint = f"bike/{self.bike_id}/position/"
-                self.position = await self.stromer_call_api(endpoint=endpoint)
-                log = f"Stromer position: {self.position}"
-                LOGGER.debug(log)
-                return
-
-            except Exception as e:
-                log = f"Stromer error: api call failed: {e}"
-                LOGGER.error(log)
-                log = f"Stromer retry: {attempts}/10"
-                LOGGER.debug(log)
+                async with asyncio.timeout(max(0.0, deadline - time.monotonic())):
+                    return await call(0)
+            except retry_on as e:
+                LOGGER.warning("Stromer error: unable to %s: %s", description, e)
+                self.metrics.record_error(e)
+                raise TransientApiError(f"Unable to {description}") from e
+
+        deadline = time.monotonic() + policy.budget
+        context = _RETRY_DEADLINE.set(deadline)
+        try:
+            for attempt in range(policy.attempts):
+                try:
+                    LOGGER.debug("Attempt %s/%s to %s", attempt + 1, policy.attempts, description)
+                    async with asyncio.timeout(max(0.0, deadline - time.monotonic())):
+                        return await call(attempt)
+                except retry_on as e:
+                    LOGGER.warning("Stromer error: unable to %s (attempt %s/%s): %s", description, attempt + 1, policy.attempts, e)
+                    self.metrics.record_error(e)
+                    delay = policy.delay(attempt)
+                    if attempt + 1 >= policy.attempts or time.monotonic() + delay > deadline:
+                        LOGGER.error("Stromer error: unable to %s after %s attempts, cowardly failing", description, attempt + 1)
+                        raise ApiError(f"Unable to {description}") from e
+                    LOGGER.debug("Retrying in %.1f seconds...", delay)
+                    self.metrics.record_retry()
+                    await asyncio.sleep(delay)
+        finally:
+            _RETRY_DEADLINE.reset(context)
 
-        LOGGER.error("Stromer error: api call failed 10 times, cowardly failing")
-        raise ApiError
+        raise ApiError(f"Unable to {description}")
 
-    async def stromer_api_debouncer(self, url: str, timeout: int = 10, retries: int = 10, delay: int = 10) -> aiohttp.ClientResponse:
+    async def stromer_api_debouncer(self, url: str, timeout: int = 10) -> aiohttp.ClientResponse:
         """Debounce API-request to leverage DNS issues."""
-        for attempt in range(retries):
-            try:
-                log = f"Attempt {attempt + 1}/{retries} to interface with Stromer on {url}"
-                LOGGER.debug(log)
-                res = await self._websession.get(url, timeout=timeout)
+
+        async def _get(_: int) -> aiohttp.ClientResponse:
+            # Read the body so the connection is released (the response stays usable)
+            async with self.websession.get(url, timeout=timeout) as res:
                 res.raise_for_status()
-                return res
-            except (aiodns.error.DNSError, aiohttp.ClientError, TimeoutError) as e:
-                log = f"Error getting Stromer API (attempt {attempt + 1}/{retries}): {e}"
-                LOGGER.warning(log)
-                if attempt < retries - 1:
-                    log = f"Retrying in {delay} seconds..."
-                    LOGGER.warning(log)
-                    await asyncio.sleep(delay)
-                else:
-                    log = f"Failed to get to Stromer API after {retries} attempts."
-                    LOGGER.error(log)
-                    raise  # Re-raise the last exception if all retries fail
+                await res.read()
+            return res
+
+        return await self.stromer_retry(
+            _get,
+            f"interface with Stromer on {url}",
+            (aiodns.error.DNSError, aiohttp.ClientError, TimeoutError),
+        )
 
     async def stromer_get_code(self) -> None:
         """Retrieve authorization code from API."""
@@ -143,8 +586,7 @@ class Stromer:
             pattern = "=(.*?);"
             csrftoken = re.search(pattern, cookie).group(1)  # type: ignore[union-attr, arg-type]
         except Exception as e:
-            log = f"Stromer error: api call failed: {e} with content {res}"
-            LOGGER.error(log)
+            LOGGER.error("Stromer error: api call failed: %s with content %s", e, res)
             raise ApiError from e
 
         qs = urlencode(
@@ -166,9 +608,8 @@ class Stromer:
         if self._api_version == "v3":
             data["next"] = "/o/authorize/?" + qs
 
-        res = await self._websession.post(
-            url, data=data, headers={"Referer": url}, allow_redirects=False
-        )
+        async with self.websession.post(url, data=data, headers={"Referer": url}, allow_redirects=False) as res:
+            body = await res.read()
         next_loc = res.headers.get("Location")
         if not next_loc:
             LOGGER.debug("No next location returned from Stromer API. Full response details:")
@@ -177,7 +618,7 @@ class Stromer:
             LOGGER.debug("  Status: %s", res.status)
             LOGGER.debug("  Headers: %s", dict(res.headers))
             try:
-                body_text = await res.text()
+                body_text = body.decode(res.get_encoding())
                 LOGGER.debug("  Body: %s", body_text)
             except Exception as err:
                 raise NextLocationError("Unable to provide body information from Stromer API") from err
@@ -187,7 +628,8 @@ class Stromer:
         if not (next_loc.startswith("/") or next_loc.startswith("?")):
             raise NextLocationError(f"Invalid next location: '{next_loc}'. Expected start with '/' or '?'.")
 
-        res = await self._websession.get(next_url, allow_redirects=False)
+        async with self.websession.get(next_url, allow_redirects=False) as res:
+            await res.read()
         self._code = res.headers.get("Location")
         self._code = self._code.split("=")[1]  # type: ignore[union-attr]
 
@@ -206,74 +648,230 @@ class Stromer:
             data["client_secret"] = self._client_secret
             data["redirect_uri"] = "stromerauth://auth"
 
-        res = await self._websession.post(url, data=data)
-        token = json.loads(await res.text())
-        self._token = token["access_token"]
+        async with self.websession.post(url, data=data) as res:
+            if 400 <= res.status < 500:
+                raise AuthenticationError(f"Token request rejected with status {res.status}")
+            if res.status != 200:
+                raise ApiError(f"Token request failed with status {res.status}")
+            token = await stromer_decode(res)
+        self._set_token(StromerToken.from_response(token))
+
+    async def stromer_refresh_access_token(self) -> None:
+        """Renew the access token using the refresh token grant."""
+        if self._token is None or not self._token.refresh_token:
+            raise ApiError("No refresh token available")
+
+        url = f"{self.base_url}/mobile/v4/o/token/"
+        data = {
+            "grant_type": "refresh_token",
+            "client_id": self._client_id,
+            "refresh_token": self._token.refresh_token,
+        }
+
+        if self._api_version == "v3":
+            url = f"{self.base_url}/o/token/"
+            data["client_secret"] = self._client_secret
+
+        async with self.websession.post(url, data=data) as res:
+            if res.status != 200:
+                raise ApiError(f"Token refresh failed with status {res.status}")
+            token = await stromer_decode(res)
+        self._set_token(StromerToken.from_response(token))
+        LOGGER.debug("Stromer access token refreshed")
+
+    @property
+    def token(self) -> str | None:
+        """Return the current access token."""
+        if self._token is None:
+            return None
+        return self._token.access_token
+
+    @property
+    def websession(self) -> aiohttp.ClientSession:
+        """Return the shared web session."""
+        if self._websession is None or self._closed:
+            raise ApiError("Stromer API not connected")
+        return self._websession
+
+    def api_url(self, endpoint: str) -> str:
+        """Return the full API url for an endpoint."""
+        if self._api_version == "v3":
+            return f"{self.base_url}/rapi/mobile/v2/{endpoint}"
+        return f"{self.base_url}/rapi/mobile/v4.1/{endpoint}"
+
+    def api_headers(self) -> dict[str, str]:
+        """Return the authorization headers for the current token."""
+        return {"Authorization": f"Bearer {self.token}"}
+
+    async def stromer_request(self, method: str, endpoint: str, **kwargs: Any) -> aiohttp.ClientResponse:
+        """Perform an authorized API request, renewing the token once when it is rejected."""
+        await self.stromer_ensure_token()
+        token = self.token
+        url = self.api_url(endpoint)
+        res = await self._stromer_timed_request(method, endpoint, url, **kwargs)
+        if res.status == 401:
+            LOGGER.info("Stromer API rejected the access token, renewing")
+            await self.stromer_ensure_token(stale=token)
+            res = await self._stromer_timed_request(method, endpoint, url, **kwargs)
+        return res
+
+    async def _stromer_timed_request(self, method: str, endpoint: str, url: str, **kwargs: Any) -> aiohttp.ClientResponse:
+        """Perform a request, reading its body and recording its latency and size."""
+        start = time.monotonic()
+        try:
+            res = await self.websession.request(method, url, headers=self.api_headers(), **kwargs)
+            try:
+                body = await res.read()
+            except BaseException:
+                res.release()
+                raise
+        except (aiohttp.ClientError, TimeoutError) as e:
+            self.metrics.record_error(e)
+            raise
+        self.metrics.record_request(endpoint, time.monotonic() - start, len(body))
+        return res
+
+    async def stromer_call_api(self, endpoint: str, full=False, payload_logger: PayloadLogger | None = None) -> Any:
+        """Retrieve data from the API, logging the payload with the given (or the account) payload logger."""
+        res = await self.stromer_request("GET", endpoint, data={})
+        ret = await stromer_decode(res, envelope=True)
+        LOGGER.debug("API call status: %s", res.status)
+        (payload_logger or self.payload_logger).log(endpoint, ret)
+        if full:
+            return ret["data"]
+        if not ret["data"]:
+            raise ApiError(f"No data returned for {endpoint}")
+        return ret["data"][0]
+
+
+class Stromer:
+    """Set up a Stromer bike handle on a shared account."""
+
+    def __init__(self, account: StromerAccount, bike_id: str) -> None:
+        """Initialize stromer bike."""
+        self._account = account
+
+        self.status: dict = {}
+        self.position: dict = {}
+
+        self.bike_id: str = bike_id
+        self.bike_name: str | None = None
+        self.bike_model: str | None = None
+        # Payloads of this bike are logged using its own mode, the account logs the bike list
+        self.payload_logger = PayloadLogger()
+
+    @property
+    def metrics(self) -> StromerMetrics:
+        """Return the API metrics of the account this bike belongs to."""
+        return self._account.metrics
+
+    async def stromer_update(self, *, status: bool = True, position: bool = True) -> None:
+        """Update stromer data through API, fetching the requested endpoints concurrently."""
+        pending = {}
+        if status:
+            pending["status"] = f"bike/{self.bike_id}/state/"
+        if position:
+            pending["position"] = f"bike/{self.bike_id}/position/"
+        if not pending:
+            return
+
+        breaker = self._account.circuit_breaker
+        if not breaker.allow():
+            raise ApiError("Stromer API unavailable, skipping update")
+
+        fetched: dict[str, dict] = {}
+
+        async def _fetch(_: int) -> None:
+            # Renew the token once for all endpoints, so a failing login is not repeated per endpoint
+            await self._account.stromer_ensure_token()
+
+            # Only (re)fetch the endpoints that did not succeed yet
+            results = await asyncio.gather(
+                *(
+                    self._account.stromer_call_api(endpoint=endpoint, payload_logger=self.payload_logger)
+                    for endpoint in pending.values()
+                ),
+                return_exceptions=True,
+            )
+            errors = []
+            for (kind, endpoint), result in zip(list(pending.items()), results, strict=True):
+                if isinstance(result, BaseException):
+                    LOGGER.error("Stromer error: api call to %s failed: %s", endpoint, result)
+                    errors.append(result)
+                    continue
+                fetched[kind] = result
+                pending.pop(kind)
+                LOGGER.debug("Stromer %s fetched", kind)
+
+            # Only retry when all failures are temporary
+            for error in errors:
+                if not isinstance(error, RETRYABLE_ERRORS):
+                    raise error
+            if pending:
+                raise TransientApiError(f"Unable to fetch {', '.join(pending)}")
+
+        try:
+            await self._account.stromer_retry(_fetch, f"update bike {self.bike_id}")
+        except ApiError:
+            breaker.record_failure()
+            raise
+        else:
+            breaker.record_success()
+        finally:
+            # Never leave the breaker waiting for a probe that was cancelled or rejected
+            breaker.release()
+
+        if "status" in fetched:
+            self.status = fetched["status"]
+        if "position" in fetched:
+            self.position = fetched["position"]
+
+    async def stromer_update_status(self) -> None:
+        """Poll only the bike state through a single API call, without retries."""
+        endpoint = f"bike/{self.bike_id}/state/"
+        try:
+            self.status = await self._account.stromer_call_api(endpoint=endpoint, payload_logger=self.payload_logger)
+        except (aiohttp.ClientError, TimeoutError) as e:
+            raise ApiError(f"Unable to fetch status: {e}") from e
 
     async def stromer_call_lock(self, state: bool) -> None:
         """Lock or unlock the bike through the API."""
         endpoint = f"bike/{self.bike_id}/settings/"
-        url = f"{self.base_url}/rapi/mobile/v4.1/{endpoint}"
-        if self._api_version == "v3":
-            url = f"{self.base_url}/rapi/mobile/v2/{endpoint}"
-
         data = {"lock": state}
-        headers = {"Authorization": f"Bearer {self._token}"}
-        res = await self._websession.post(url, headers=headers, json=data)
-        ret = json.loads(await res.text())
-        log = f"API call lock status: {res.status}"
-        LOGGER.debug(log)
-        log = f"API call lock returns: {ret}"
-        LOGGER.debug(log)
+        res = await self._account.stromer_request("POST", endpoint, json=data)
+        ret = await stromer_decode(res)
+        LOGGER.debug("API call lock status: %s", res.status)
+        self.payload_logger.log(endpoint, ret)
 
     async def stromer_call_light(self, state: str) -> None:
         """Switch the bike light through the API."""
         endpoint = f"bike/{self.bike_id}/light/"
-        url = f"{self.base_url}/rapi/mobile/v4.1/{endpoint}"
-        if self._api_version == "v3":
-            url = f"{self.base_url}/rapi/mobile/v2/{endpoint}"
-
         data = {"mode": state}
-        headers = {"Authorization": f"Bearer {self._token}"}
-        res = await self._websession.post(url, headers=headers, json=data)
-        ret = json.loads(await res.text())
-        log = f"API call light status: {res.status}"
-        LOGGER.debug(log)
-        log = f"API call light returns: {ret}"
-        LOGGER.debug(log)
+        res = await self._account.stromer_request("POST", endpoint, json=data)
+        ret = await stromer_decode(res)
+        LOGGER.debug("API call light status: %s", res.status)
+        self.payload_logger.log(endpoint, ret)
 
     async def stromer_reset_trip_data(self) -> None:
         """Reset the trip data through the API."""
         endpoint = f"bike/id/{self.bike_id}/trip_data/"
-        url = f"{self.base_url}/rapi/mobile/v4.1/{endpoint}"
-        if self._api_version == "v3":
-            url = f"{self.base_url}/rapi/mobile/v2/{endpoint}"
-
-        headers = {"Authorization": f"Bearer {self._token}"}
-        res = await self._websession.delete(url, headers=headers)
+        res = await self._account.stromer_request("DELETE", endpoint)
         if res.status != 204:
             raise ApiError
 
-    async def stromer_call_api(self, endpoint: str, full=False) -> Any:
-        """Retrieve data from the API."""
-        url = f"{self.base_url}/rapi/mobile/v4.1/{endpoint}"
-        if self._api_version == "v3":
-            url = f"{self.base_url}/rapi/mobile/v2/{endpoint}"
-
-        headers = {"Authorization": f"Bearer {self._token}"}
-        res = await self._websession.get(url, headers=headers, data={})
-        ret = json.loads(await res.text())
-        log = f"API call status: {res.status}"
-        LOGGER.debug(log)
-        log = f"API call returns: {ret}"
-        LOGGER.debug(log)
-        if full:
-          return ret["data"]
-        return ret["data"][0]
-
 
 class ApiError(Exception):
     """Error to indicate something wrong with the API."""
 
-class NextLocationError(Exception):
+class TransientApiError(ApiError):
+    """Error to indicate a temporary API failure that may be retried."""
+
+class AuthenticationError(Exception):
+    """Error to indicate the login was rejected."""
+
+class NextLocationError(AuthenticationError):
     """Error to indicate something wrong returned in next location."""
+
+
+# Errors worth retrying: transport failures and server errors
+RETRYABLE_ERRORS = (aiohttp.ClientError, TimeoutError, TransientApiError)
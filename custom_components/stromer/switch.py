@@ -12,9 +12,9 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, LOGGER
+from .const import DOMAIN
 from .coordinator import StromerDataUpdateCoordinator
-from .entity import StromerEntity
+from .entity import StromerEntity, async_add_stromer_entities
 
 SWITCHES: tuple[SwitchEntityDescription, ...] = (
     SwitchEntityDescription(
@@ -36,14 +36,13 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry, asyn
     """Set up the Stromer Switches from a config entry."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
 
-    entities = []
-    for idx, data in enumerate(coordinator.data.bikedata.items()):
-        for description in SWITCHES:
-            if data[0] == description.key:
-                entities.append(StromerSwitch(coordinator, idx, data, description))
-                LOGGER.debug("Add %s %s switch", data, description.translation_key)
-
-    async_add_entities(entities, update_before_add=False)
+    async_add_stromer_entities(
+        coordinator,
+        config_entry,
+        async_add_entities,
+        SWITCHES,
+        lambda description: StromerSwitch(coordinator, description),
+    )
 
 
 class StromerSwitch(StromerEntity, SwitchEntity):  # type: ignore[misc]
@@ -56,40 +55,47 @@ class StromerSwitch(StromerEntity, SwitchEntity):  # type: ignore[misc]
     def __init__(
         self,
         coordinator: StromerDataUpdateCoordinator,
-        idx: int,
-        data: dict,
         description: SwitchEntityDescription,
     ):
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self._ent = data[0]
+        self._ent = description.key
         self._coordinator = coordinator
 
         device_id = coordinator.data.bike_id
 
         self.entity_description = description
         self._attr_unique_id = f"{device_id}-{description.key}-sw"
+        self._requested: bool | None = None
 
     @callback  # type: ignore[misc]
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self._attr_is_on = self._coordinator.data.bikedata.get(self._ent)
+        is_on = getattr(self._coordinator.data.bikedata, self._ent)
+        # Keep showing a requested state until it is confirmed or rolled back
+        if self._requested is not None and is_on != self._requested:
+            return
+        self._attr_is_on = is_on
+        self.async_write_ha_state()
+
+    async def _async_set_state(self, state: bool) -> None:
+        """Show the requested state right away, then confirm or roll back."""
+        self._requested = state
+        self._attr_is_on = state
         self.async_write_ha_state()
+        confirmed = False
+        try:
+            confirmed = await self._coordinator.async_send_command(self._ent, state)
+        finally:
+            self._requested = None
+            if not confirmed:
+                self._attr_is_on = getattr(self._coordinator.data.bikedata, self._ent)
+                self.async_write_ha_state()
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the device on."""
-        if self.entity_description.key == "lock_flag":
-            await self._coordinator.stromer.stromer_call_lock(True)
-        if self.entity_description.key == "light_on":
-            await self._coordinator.stromer.stromer_call_light("on")
-        # Call update on the bike so `is_on` correctly reflects status
-        await self._coordinator.async_request_refresh()
+        await self._async_set_state(True)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the device off."""
-        if self.entity_description.key == "lock_flag":
-            await self._coordinator.stromer.stromer_call_lock(False)
-        if self.entity_description.key == "light_on":
-            await self._coordinator.stromer.stromer_call_light("off")
-        # Call update on the bike so `is_on` correctly reflects status
-        await self._coordinator.async_request_refresh()
+        await self._async_set_state(False)
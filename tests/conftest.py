@@ -0,0 +1,51 @@
+"""Fixtures running the Stromer API client against the mock cloud."""
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+import importlib.util
+from pathlib import Path
+import sys
+from types import ModuleType
+from typing import Any
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "tools"))
+
+from stromer_mock import MockStromerCloud  # noqa: E402
+
+MockAccount = Callable[..., AbstractAsyncContextManager[tuple[Any, MockStromerCloud]]]
+
+
+@pytest.fixture(scope="session")
+def stromer() -> ModuleType:
+    """Import the API client, without requiring Home Assistant."""
+    spec = importlib.util.spec_from_file_location("stromer", ROOT / "custom_components" / "stromer" / "stromer.py")
+    module = importlib.util.module_from_spec(spec)  # type: ignore[arg-type]
+    sys.modules["stromer"] = module
+    spec.loader.exec_module(module)  # type: ignore[union-attr]
+    return module
+
+
+@pytest.fixture
+def mock_account(stromer: ModuleType) -> MockAccount:
+    """Return a factory serving a mock cloud and an account using it, with fast retries."""
+
+    @asynccontextmanager
+    async def _mock_account(
+        password: str = "secret", cloud_password: str | None = None, **cloud_options: Any
+    ) -> AsyncIterator[tuple[Any, MockStromerCloud]]:
+        cloud = MockStromerCloud(password=cloud_password, seed=0, **cloud_options)
+        base_url = await cloud.start()
+        account = stromer.StromerAccount("test@example.com", password, "4Ptest", None)
+        account.base_url = base_url
+        account.retry_policy = stromer.RetryPolicy(attempts=4, base_delay=0.01, max_delay=0.05, budget=2)
+        try:
+            yield account, cloud
+        finally:
+            await account.stromer_disconnect()
+            await cloud.stop()
+
+    return _mock_account
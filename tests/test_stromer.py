@@ -0,0 +1,156 @@
+"""Tests for the retries, circuit breaker and token handling of the Stromer API client."""
+from __future__ import annotations
+
+import asyncio
+import time
+from types import ModuleType
+
+import pytest
+
+from tests.conftest import MockAccount
+
+LOGIN = "/mobile/v4/login/"
+TOKEN = "/mobile/v4/o/token/"
+
+
+def _expired_token(refresh_token: str | None = None) -> dict:
+    """Return a stored token that has to be renewed before use."""
+    return {"access_token": "stale", "refresh_token": refresh_token, "expires_at": time.time() - 1, "refresh_at": time.time() - 1}
+
+
+def test_circuit_breaker_opens_and_probes(stromer: ModuleType) -> None:
+    """Test the breaker opens at the threshold and lets a single probe through."""
+    breaker = stromer.CircuitBreaker(threshold=2, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.is_open
+
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.allow()
+
+
+def test_cancelled_probe_is_released(stromer: ModuleType, mock_account: MockAccount) -> None:
+    """Test a cancelled half-open probe does not block later updates."""
+
+    async def scenario() -> None:
+        async with mock_account(bikes=1, latency=0.5) as (account, cloud):
+            await account.stromer_connect()
+            bike = account.get_bike(str(next(iter(cloud.bikes))))
+            breaker = account.circuit_breaker
+            breaker.reset_timeout = 0
+            for _ in range(breaker.threshold):
+                breaker.record_failure()
+
+            probe = asyncio.create_task(bike.stromer_update())
+            await asyncio.sleep(0.1)
+            probe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await probe
+
+            cloud.latency = 0
+            await bike.stromer_update()
+            assert not breaker.is_open
+            assert bike.status
+
+    asyncio.run(scenario())
+
+
+def test_server_errors_retried_within_budget(stromer: ModuleType, mock_account: MockAccount) -> None:
+    """Test server errors are retried, giving up within the time budget."""
+
+    async def scenario() -> None:
+        async with mock_account(bikes=1) as (account, cloud):
+            await account.stromer_connect()
+            bike = account.get_bike(str(next(iter(cloud.bikes))))
+            cloud.error_rate = 1.0
+
+            start = time.monotonic()
+            with pytest.raises(stromer.ApiError):
+                await bike.stromer_update()
+            assert time.monotonic() - start < account.retry_policy.budget + 1
+            assert account.metrics.retries == account.retry_policy.attempts - 1
+
+            cloud.error_rate = 0.0
+            await bike.stromer_update()
+            assert bike.status
+
+    asyncio.run(scenario())
+
+
+def test_rejected_login_is_not_retried(stromer: ModuleType, mock_account: MockAccount) -> None:
+    """Test a rejected login is tried once for all bikes and never retried."""
+
+    async def scenario() -> None:
+        async with mock_account(password="wrong", cloud_password="secret", bikes=3) as (account, cloud):
+            account.restore_token(_expired_token())
+            bikes = [account.get_bike(str(bike_id)) for bike_id in cloud.bikes]
+
+            for _ in range(2):
+                results = await asyncio.gather(*(bike.stromer_update() for bike in bikes), return_exceptions=True)
+                assert all(isinstance(result, stromer.AuthenticationError) for result in results)
+            # A single login: the login page and the rejected credentials
+            assert cloud.requests[LOGIN] == 2
+            assert account.metrics.retries == 0
+            assert not account.circuit_breaker.is_open
+
+            account.update_credentials("secret", None)
+            await bikes[0].stromer_update()
+            assert bikes[0].status
+
+    asyncio.run(scenario())
+
+
+def test_token_renewed_once_for_concurrent_callers(stromer: ModuleType, mock_account: MockAccount) -> None:
+    """Test concurrent updates with an expired token refresh it only once."""
+
+    async def scenario() -> None:
+        async with mock_account(bikes=3) as (account, cloud):
+            await account.stromer_connect()
+            account._token = stromer.StromerToken.from_dict(_expired_token(account.token_data["refresh_token"]))
+            cloud.requests.clear()
+
+            bikes = [account.get_bike(str(bike_id)) for bike_id in cloud.bikes]
+            await asyncio.gather(*(bike.stromer_update() for bike in bikes))
+            assert cloud.requests[TOKEN] == 1
+            assert LOGIN not in cloud.requests
+
+    asyncio.run(scenario())
+
+
+def test_failed_renewal_is_shared(stromer: ModuleType, mock_account: MockAccount) -> None:
+    """Test callers waiting for a failing renewal do not each log in again."""
+
+    async def scenario() -> None:
+        async with mock_account(bikes=3) as (account, cloud):
+            account.restore_token(_expired_token())
+            cloud.error_rate = 1.0
+            account.retry_policy.attempts = 1
+
+            results = await asyncio.gather(
+                *(account.stromer_ensure_token() for _ in range(5)), return_exceptions=True
+            )
+            assert all(isinstance(result, stromer.ApiError) for result in results)
+            # Only the first caller requested the login page
+            assert cloud.requests[LOGIN] == 1
+
+    asyncio.run(scenario())
+
+
+def test_disconnected_account_refuses_requests(stromer: ModuleType, mock_account: MockAccount) -> None:
+    """Test no new session is created after disconnecting."""
+
+    async def scenario() -> None:
+        async with mock_account(bikes=1) as (account, cloud):
+            await account.stromer_connect()
+            bike = account.get_bike(str(next(iter(cloud.bikes))))
+            await account.stromer_disconnect()
+
+            with pytest.raises(stromer.ApiError):
+                await bike.stromer_update()
+            assert account._websession is None
+
+    asyncio.run(scenario())
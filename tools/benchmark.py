@@ -0,0 +1,239 @@
+"""Micro-benchmarks for the Stromer refresh and entity pipeline.
+
+Runs the hot paths against the local mock cloud (see `stromer_mock.py`):
+
+    python tools/benchmark.py
+    python tools/benchmark.py --rounds 500 --filter coordinator
+
+Each run is appended to `.benchmarks/results.jsonl` and compared to the
+previous run, flagging benchmarks that got slower than the threshold. The
+coordinator and platform benchmarks need Home Assistant to be installed and
+are skipped otherwise.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+import importlib.util
+import json
+import logging
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any
+from unittest.mock import MagicMock
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tools"))
+
+from stromer_mock import MockStromerCloud  # noqa: E402
+
+HAS_HOMEASSISTANT = importlib.util.find_spec("homeassistant") is not None
+
+RESULTS = ROOT / ".benchmarks" / "results.jsonl"
+
+Benchmark = Callable[[], Awaitable[Any]]
+
+
+def _load_client() -> Any:
+    """Import the API client, without requiring Home Assistant when it is not installed."""
+    if HAS_HOMEASSISTANT:
+        from custom_components.stromer import stromer  # noqa: PLC0415
+
+        return stromer
+    spec = importlib.util.spec_from_file_location("stromer", ROOT / "custom_components" / "stromer" / "stromer.py")
+    module = importlib.util.module_from_spec(spec)  # type: ignore[arg-type]
+    sys.modules["stromer"] = module
+    spec.loader.exec_module(module)  # type: ignore[union-attr]
+    return module
+
+
+async def _measure(func: Benchmark, rounds: int, warmup: int) -> dict[str, float]:
+    """Run a benchmark, returning timings in microseconds."""
+    for _ in range(warmup):
+        await func()
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await func()
+        timings.append((time.perf_counter() - start) * 1e6)
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "rounds": rounds,
+    }
+
+
+async def _client_benchmarks(base_url: str, cloud: MockStromerCloud) -> tuple[dict[str, Benchmark], Any]:
+    """Set up the benchmarks for the API client."""
+    stromer = _load_client()
+    account = stromer.StromerAccount("bench@example.com", "secret", "4Pbench", None)
+    account.base_url = base_url
+    await account.stromer_connect()
+    bikes = [account.get_bike(str(bike_id), f"Bike {bike_id}", "ST3") for bike_id in cloud.bikes]
+
+    async def stromer_update() -> None:
+        await bikes[0].stromer_update()
+
+    async def stromer_update_all_bikes() -> None:
+        await asyncio.gather(*(bike.stromer_update() for bike in bikes))
+
+    return {
+        "stromer_update": stromer_update,
+        "stromer_update_all_bikes": stromer_update_all_bikes,
+    }, account
+
+
+async def _homeassistant_benchmarks(account: Any, cloud: MockStromerCloud) -> dict[str, Benchmark]:
+    """Set up the benchmarks for the coordinator and entity platforms."""
+    from datetime import timedelta  # noqa: PLC0415
+
+    from custom_components.stromer import binary_sensor, button, sensor, switch  # noqa: PLC0415
+    from custom_components.stromer.const import DOMAIN  # noqa: PLC0415
+    from custom_components.stromer.coordinator import StromerDataUpdateCoordinator  # noqa: PLC0415
+
+    bike_id = str(next(iter(cloud.bikes)))
+    hass = MagicMock()
+    entry = MagicMock(entry_id="benchmark")
+    coordinator = StromerDataUpdateCoordinator(
+        hass,
+        account.get_bike(bike_id, "Bike", "ST3"),
+        timedelta(minutes=10),
+        timedelta(minutes=1),
+        timedelta(hours=1),
+    )
+    coordinator.data = await coordinator._async_update_data()
+    hass.data = {DOMAIN: {entry.entry_id: coordinator}}
+
+    async def coordinator_update() -> None:
+        coordinator.data = await coordinator._async_update_data()
+
+    async def coordinator_update_changed() -> None:
+        # Move the bike so every refresh returns a different payload
+        cloud.riding = True
+        cloud.bikes[int(bike_id)].lock_flag = False
+        try:
+            coordinator.data = await coordinator._async_update_data()
+        finally:
+            cloud.riding = False
+            cloud.bikes[int(bike_id)].lock_flag = True
+
+    def _platform(module: Any) -> Benchmark:
+        async def setup_entry() -> None:
+            await module.async_setup_entry(hass, entry, lambda entities, update_before_add=False: None)
+
+        return setup_entry
+
+    sensors: list[Any] = []
+    await sensor.async_setup_entry(hass, entry, lambda entities, update_before_add=False: sensors.extend(entities))
+    timestamps = [entity for entity in sensors if entity.entity_description.device_class == "timestamp"]
+
+    async def sensor_native_value() -> None:
+        for entity in sensors:
+            entity.native_value  # noqa: B018
+
+    async def sensor_native_value_timestamp() -> None:
+        for entity in timestamps:
+            entity.native_value  # noqa: B018
+
+    return {
+        "coordinator_update": coordinator_update,
+        "coordinator_update_changed": coordinator_update_changed,
+        "setup_entry_sensor": _platform(sensor),
+        "setup_entry_binary_sensor": _platform(binary_sensor),
+        "setup_entry_switch": _platform(switch),
+        "setup_entry_button": _platform(button),
+        "sensor_native_value": sensor_native_value,
+        "sensor_native_value_timestamp": sensor_native_value_timestamp,
+    }
+
+
+def _previous_run() -> dict[str, Any] | None:
+    """Return the last stored run."""
+    if not RESULTS.exists():
+        return None
+    lines = RESULTS.read_text(encoding="utf-8").splitlines()
+    return json.loads(lines[-1]) if lines else None
+
+
+def _store_run(results: dict[str, dict[str, float]]) -> None:
+    """Append a run to the results file."""
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            capture_output=True,
+            check=False,
+            cwd=ROOT,
+            text=True,
+        ).stdout.strip()
+    except OSError:
+        revision = ""
+    RESULTS.parent.mkdir(exist_ok=True)
+    run = {"timestamp": datetime.now(tz=UTC).isoformat(), "revision": revision, "results": results}
+    with RESULTS.open("a", encoding="utf-8") as file:
+        file.write(json.dumps(run) + "\n")
+
+
+async def _run(args: argparse.Namespace) -> int:
+    """Run the benchmarks and report them against the previous run."""
+    cloud = MockStromerCloud(bikes=args.bikes, seed=0)
+    base_url = await cloud.start()
+    benchmarks, account = await _client_benchmarks(base_url, cloud)
+    if HAS_HOMEASSISTANT:
+        benchmarks.update(await _homeassistant_benchmarks(account, cloud))
+    else:
+        print("Home Assistant not installed, skipping coordinator and platform benchmarks")  # noqa: T201
+
+    results = {}
+    try:
+        for name, func in benchmarks.items():
+            if args.filter and args.filter not in name:
+                continue
+            results[name] = await _measure(func, args.rounds, args.warmup)
+    finally:
+        await account.stromer_disconnect()
+        await cloud.stop()
+
+    previous = _previous_run()
+    regressions = 0
+    print(f"{'benchmark':<32}{'median (us)':>14}{'min (us)':>12}{'change':>10}")  # noqa: T201
+    for name, result in results.items():
+        change = ""
+        if previous and (before := previous["results"].get(name)):
+            ratio = result["median"] / before["median"] - 1
+            change = f"{ratio:+.1%}"
+            if ratio > args.threshold:
+                change += " !"
+                regressions += 1
+        print(f"{name:<32}{result['median']:>14.1f}{result['min']:>12.1f}{change:>10}")  # noqa: T201
+
+    if not args.no_store:
+        _store_run(results)
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+def main() -> None:
+    """Parse arguments and run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--bikes", type=int, default=3, help="number of simulated bikes")
+    parser.add_argument("--filter", default=None, help="only run benchmarks containing this text")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative slowdown flagged as regression")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--no-store", action="store_true", help="do not store the results of this run")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(asyncio.run(_run(args)))
+
+
+if __name__ == "__main__":
+    main()
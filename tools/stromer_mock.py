@@ -0,0 +1,332 @@
+"""Local stand-in for the Stromer cloud API, for offline testing and benchmarking.
+
+Run it standalone:
+
+    python tools/stromer_mock.py --bikes 3 --latency 0.2 --error-rate 0.1
+
+and point the client to it by setting `StromerAccount.base_url` to the printed
+url. Any username, password and client id are accepted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+from dataclasses import dataclass, field
+import logging
+import random
+import secrets
+import time
+from typing import Any
+
+from aiohttp import web
+
+LOGGER = logging.getLogger(__name__)
+
+CSRF_COOKIE = "csrftoken"
+
+
+@dataclass
+class MockBike:
+    """Simulated bike state."""
+
+    bike_id: int
+    nickname: str
+    biketype: str = "ST3"
+    lock_flag: bool = True
+    light_on: bool = False
+    latitude: float = 52.0907
+    longitude: float = 5.1214
+    speed: float = 0.0
+    battery_soc: float = 80.0
+    total_distance: float = 1234.5
+    total_energy_consumption: float = 23456.0
+    trip_distance: float = 12.3
+    rcvts: int = field(default_factory=lambda: int(time.time()))
+    _moved_at: float = field(default_factory=time.monotonic)
+
+    def advance(self, riding: bool) -> None:
+        """Move an unlocked bike along when riding is simulated."""
+        now = time.monotonic()
+        elapsed, self._moved_at = now - self._moved_at, now
+        if not riding or self.lock_flag:
+            self.speed = 0.0
+            return
+        self.speed = 20.0
+        distance = self.speed * elapsed / 3600
+        self.latitude += distance / 111.0
+        self.total_distance += distance
+        self.trip_distance += distance
+        self.total_energy_consumption += distance * 10
+        self.battery_soc = max(0.0, self.battery_soc - distance * 0.5)
+        self.rcvts = int(time.time())
+
+    def summary(self) -> dict[str, Any]:
+        """Return the bike as listed by the `bike/` endpoint."""
+        return {"bikeid": self.bike_id, "nickname": self.nickname, "biketype": self.biketype}
+
+    def state(self) -> dict[str, Any]:
+        """Return the payload of the `state/` endpoint."""
+        return {
+            "assistance_level": 50,
+            "atmospheric_pressure": 1.013,
+            "average_energy_consumption": 9,
+            "average_speed_total": 24.3,
+            "average_speed_trip": 21.7,
+            "battery_SOC": round(self.battery_soc),
+            "battery_health": 96,
+            "battery_temp": 18.5,
+            "bike_speed": self.speed,
+            "light_on": self.light_on,
+            "lock_flag": self.lock_flag,
+            "motor_temp": 21.0,
+            "power_on_cycles": 321,
+            "rcvts": self.rcvts,
+            "suiversion": "4.5.1.0",
+            "theft_flag": False,
+            "tntversion": "1.2.3",
+            "total_distance": round(self.total_distance, 1),
+            "total_energy_consumption": round(self.total_energy_consumption),
+            "total_time": 123456,
+            "trip_distance": round(self.trip_distance, 1),
+            "trip_time": 1800,
+        }
+
+    def position(self) -> dict[str, Any]:
+        """Return the payload of the `position/` endpoint."""
+        return {
+            "altitude": 5,
+            "latitude": round(self.latitude, 6),
+            "longitude": round(self.longitude, 6),
+            "rcvts": self.rcvts,
+            "speed": self.speed,
+            "timets": self.rcvts,
+        }
+
+
+class MockStromerCloud:
+    """Serve the subset of the Stromer cloud API used by the integration."""
+
+    def __init__(
+        self,
+        *,
+        bikes: int = 1,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        dns_failure_rate: float = 0.0,
+        token_lifetime: int = 3600,
+        riding: bool = False,
+        password: str | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize the mock cloud."""
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.dns_failure_rate = dns_failure_rate
+        self.token_lifetime = token_lifetime
+        self.riding = riding
+        self.password = password
+        self.bikes = {1000 + idx: MockBike(1000 + idx, f"Bike {idx + 1}") for idx in range(bikes)}
+        self.requests: dict[str, int] = {}
+
+        self._random = random.Random(seed)  # nosec B311
+        self._codes: set[str] = set()
+        self._tokens: dict[str, float] = {}
+        self._refresh_tokens: set[str] = set()
+        self._runner: web.AppRunner | None = None
+        self.app = self._build_app()
+
+    def _build_app(self) -> web.Application:
+        """Set up the routes for both the v3 and v4 API."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/mobile/v4/login/", self._login_page)
+        app.router.add_post("/mobile/v4/login/", self._login)
+        app.router.add_get("/mobile/v4/o/authorize/", self._authorize)
+        app.router.add_post("/mobile/v4/o/token/", self._token)
+        app.router.add_get("/users/login/", self._login_page)
+        app.router.add_post("/users/login/", self._login)
+        app.router.add_get("/o/authorize/", self._authorize)
+        app.router.add_post("/o/token/", self._token)
+        for version in ("v4.1", "v2"):
+            prefix = f"/rapi/mobile/{version}"
+            app.router.add_get(f"{prefix}/bike/", self._bike_list)
+            app.router.add_get(f"{prefix}/bike/{{bike_id}}/state/", self._bike_state)
+            app.router.add_get(f"{prefix}/bike/{{bike_id}}/position/", self._bike_position)
+            app.router.add_post(f"{prefix}/bike/{{bike_id}}/settings/", self._bike_lock)
+            app.router.add_post(f"{prefix}/bike/{{bike_id}}/light/", self._bike_light)
+            app.router.add_delete(f"{prefix}/bike/id/{{bike_id}}/trip_data/", self._bike_trip_data)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving, returning the base url to use for the client."""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        sockets = site._server.sockets  # type: ignore[union-attr]
+        return f"http://{host}:{sockets[0].getsockname()[1]}"
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        """Count requests and inject latency, errors and connection failures."""
+        self.requests[request.path] = self.requests.get(request.path, 0) + 1
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self._random.uniform(0, self.jitter))
+        if self._random.random() < self.dns_failure_rate:
+            # Drop the connection without any response, like an unreachable host
+            if request.transport is not None:
+                request.transport.close()
+            raise web.HTTPServiceUnavailable
+        if self._random.random() < self.error_rate:
+            raise web.HTTPServiceUnavailable(text="Simulated outage")
+        return await handler(request)
+
+    async def _login_page(self, request: web.Request) -> web.Response:
+        """Serve the login page setting the CSRF cookie."""
+        response = web.Response(text="<html>login</html>", content_type="text/html")
+        response.set_cookie(CSRF_COOKIE, secrets.token_hex(16))
+        return response
+
+    async def _login(self, request: web.Request) -> web.Response:
+        """Accept any (or only the configured) password and redirect to the authorize url."""
+        data = await request.post()
+        if not (data.get("username") and data.get("password") and data.get("csrfmiddlewaretoken")):
+            return web.Response(status=200, text="Invalid login", content_type="text/html")
+        if self.password is not None and data["password"] != self.password:
+            return web.Response(status=200, text="Invalid login", content_type="text/html")
+        return web.Response(status=302, headers={"Location": str(data["next"])})
+
+    async def _authorize(self, request: web.Request) -> web.Response:
+        """Redirect to the app url carrying an authorization code."""
+        code = secrets.token_hex(8)
+        self._codes.add(code)
+        return web.Response(status=302, headers={"Location": f"stromerauth://auth?code={code}"})
+
+    async def _token(self, request: web.Request) -> web.Response:
+        """Issue tokens for authorization codes and refresh tokens."""
+        data = await request.post()
+        grant_type = data.get("grant_type")
+        if grant_type == "authorization_code" and data.get("code") in self._codes:
+            self._codes.discard(str(data["code"]))
+        elif grant_type == "refresh_token" and data.get("refresh_token") in self._refresh_tokens:
+            self._refresh_tokens.discard(str(data["refresh_token"]))
+        else:
+            return web.json_response({"error": "invalid_grant"}, status=400)
+
+        access_token = secrets.token_hex(16)
+        refresh_token = secrets.token_hex(16)
+        self._tokens[access_token] = time.time() + self.token_lifetime
+        self._refresh_tokens.add(refresh_token)
+        return web.json_response(
+            {
+                "access_token": access_token,
+                "expires_in": self.token_lifetime,
+                "refresh_token": refresh_token,
+                "scope": "bikeposition bikestatus",
+                "token_type": "Bearer",
+            }
+        )
+
+    def _authorized_bike(self, request: web.Request) -> MockBike | None:
+        """Validate the bearer token and return the requested bike."""
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if self._tokens.get(token, 0) < time.time():
+            raise web.HTTPUnauthorized(text="Invalid token")
+        if "bike_id" not in request.match_info:
+            return None
+        try:
+            bike = self.bikes[int(request.match_info["bike_id"])]
+        except (KeyError, ValueError) as err:
+            raise web.HTTPNotFound from err
+        bike.advance(self.riding)
+        return bike
+
+    async def _bike_list(self, request: web.Request) -> web.Response:
+        """Return all bikes of the account."""
+        self._authorized_bike(request)
+        return web.json_response({"data": [bike.summary() for bike in self.bikes.values()]})
+
+    async def _bike_state(self, request: web.Request) -> web.Response:
+        """Return the bike state."""
+        bike = self._authorized_bike(request)
+        return web.json_response({"data": [bike.state()]})  # type: ignore[union-attr]
+
+    async def _bike_position(self, request: web.Request) -> web.Response:
+        """Return the bike position."""
+        bike = self._authorized_bike(request)
+        return web.json_response({"data": [bike.position()]})  # type: ignore[union-attr]
+
+    async def _bike_lock(self, request: web.Request) -> web.Response:
+        """Lock or unlock the bike."""
+        bike = self._authorized_bike(request)
+        data = await request.json()
+        bike.lock_flag = bool(data["lock"])  # type: ignore[union-attr]
+        return web.json_response({"data": [{"lock": bike.lock_flag}]})  # type: ignore[union-attr]
+
+    async def _bike_light(self, request: web.Request) -> web.Response:
+        """Switch the bike light."""
+        bike = self._authorized_bike(request)
+        data = await request.json()
+        bike.light_on = data["mode"] == "on"  # type: ignore[union-attr]
+        return web.json_response({"data": [{"mode": data["mode"]}]})
+
+    async def _bike_trip_data(self, request: web.Request) -> web.Response:
+        """Reset the trip data."""
+        bike = self._authorized_bike(request)
+        bike.trip_distance = 0.0  # type: ignore[union-attr]
+        return web.Response(status=204)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Run the mock cloud until interrupted."""
+    cloud = MockStromerCloud(
+        bikes=args.bikes,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        dns_failure_rate=args.dns_failure_rate,
+        token_lifetime=args.token_lifetime,
+        riding=args.riding,
+        password=args.password,
+        seed=args.seed,
+    )
+    base_url = await cloud.start(args.host, args.port)
+    LOGGER.warning("Mock Stromer cloud serving %s bike(s) on %s", args.bikes, base_url)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await cloud.stop()
+
+
+def main() -> None:
+    """Parse arguments and start the mock cloud."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--bikes", type=int, default=1, help="number of simulated bikes")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra latency (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--dns-failure-rate", type=float, default=0.0, help="fraction of connections dropped")
+    parser.add_argument("--token-lifetime", type=int, default=3600, help="access token lifetime (seconds)")
+    parser.add_argument("--riding", action="store_true", help="move unlocked bikes")
+    parser.add_argument("--password", default=None, help="only accept this password (default: any)")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible failures")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_serve(args))
+
+
+if __name__ == "__main__":
+    main()